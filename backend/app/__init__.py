@@ -1 +1,11 @@
-"""GitHub Documentation Generator Backend Application."""
\ No newline at end of file
+"""GitHub Documentation Generator Backend Application."""
+
+import sys
+from pathlib import Path
+
+# The analysis service builds on the prototype analyzer, imported as a top-level
+# module. Appended so backend modules (e.g. main) keep priority over the
+# prototype's files of the same name.
+_PROTOTYPE_PATH = str(Path(__file__).parent.parent.parent / "prototype")
+if _PROTOTYPE_PATH not in sys.path:
+    sys.path.append(_PROTOTYPE_PATH)
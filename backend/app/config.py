@@ -28,6 +28,36 @@ class Config:
         '.py': 'python'
     }
     
+    # Extension -> language for every file type the code scanner picks up
+    SCANNED_EXTENSIONS = {
+        '.py': 'python',
+        '.js': 'javascript',
+        '.jsx': 'javascript',
+        '.ts': 'typescript',
+        '.tsx': 'typescript',
+        '.java': 'java',
+        '.cpp': 'cpp',
+        '.c': 'c',
+        '.go': 'go',
+        '.rs': 'rust',
+        '.php': 'php',
+        '.rb': 'ruby',
+        '.cs': 'csharp',
+        '.swift': 'swift',
+        '.kt': 'kotlin',
+        **SUPPORTED_EXTENSIONS
+    }
+    
+    # Analyses allowed to run at once; further submissions wait in the queue
+    MAX_CONCURRENT_ANALYSES = 4
+    
+    # Analysis result cache, keyed by repository URL and HEAD commit
+    RESULT_CACHE_SIZE = 32
+    RESULT_CACHE_TTL = 24 * 60 * 60  # 24 hours
+    
+    # Connections uvicorn serves at once before answering 503
+    SERVER_LIMIT_CONCURRENCY = 200
+    
     # Rate limiting
     REQUESTS_PER_MINUTE = 60
     REQUESTS_PER_HOUR = 1000
@@ -1,18 +1,108 @@
 """Core analysis engine for GitHub repositories."""
 
 import os
+import re
+import logging
 import time
+import asyncio
+import functools
 import tempfile
+import tarfile
 import shutil
-from typing import Dict, Any, List, Optional
+import queue
+import threading
+from collections import Counter, OrderedDict
+from itertools import chain, compress
+from operator import itemgetter
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
+from urllib.parse import urlparse
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import httpx
 from git import Repo
-from concurrent.futures import ThreadPoolExecutor
 
-from .extractor import CodeExtractor
+try:
+    # libgit2 bindings clone in-process, without spawning a git subprocess
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+from .extractor import CodeExtractor, prune_extract_cache
 from .llm_processor import LLMProcessor
+from ..config import Config
 from ..models import AnalysisResult, FileSummary
 
+logger = logging.getLogger(__name__)
+
+# Directories that never contain first-party source worth analyzing
+_EXCLUDED_DIRS = frozenset({
+    'node_modules', '__pycache__', 'venv', 'env', 'build', 
+    'dist', 'target', '.git', 'vendor'
+})
+
+# One compiled check for every directory the walk refuses to enter: hidden
+# directories plus the exact names in _EXCLUDED_DIRS
+_EXCLUDED_DIR_RE = re.compile(
+    r'\.|(?:' + '|'.join(map(re.escape, sorted(_EXCLUDED_DIRS))) + r')\Z'
+)
+
+# Column accessors for the per-file records emitted by CodeExtractor.analyze_file,
+# which always sets every one of these keys
+_get_is_backend = itemgetter('is_backend')
+_get_api_count = itemgetter('api_count')
+_get_function_count = itemgetter('function_count')
+_get_language = itemgetter('language')
+_get_file_purpose = itemgetter('file_purpose')
+_get_dependencies = itemgetter('dependencies')
+
+# (repo_url, head_sha, with_llm) -> (stored_at, result), least recently used first
+_result_cache: "OrderedDict[Tuple[str, str, bool], Tuple[float, AnalysisResult]]" = OrderedDict()
+
+# Reader threads per scan; file reads release the GIL, so several threads
+# keep the disk busy while the walker is still listing directories
+_SCAN_READERS = 8
+_SCAN_BATCH_SIZE = 64
+
+# Strong references to pending temp dir removals so they are not collected
+_cleanup_tasks = set()
+
+# Shared across analyses so worker start-up is paid once per process
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool used for CPU-bound file analysis."""
+    
+    global _process_pool
+    
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        # Trim the extraction cache once per pool, off the event loop
+        _process_pool.submit(prune_extract_cache)
+    
+    return _process_pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next _get_process_pool call starts a fresh one."""
+    
+    global _process_pool
+    
+    # Another analysis may already have replaced it
+    if _process_pool is pool:
+        _process_pool = None
+    
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_tarball(archive_path: str, extract_dir: str) -> None:
+    """Extract a gzipped tarball in a single forward pass."""
+    
+    with tarfile.open(archive_path, mode='r|gz') as tar:
+        # Refuse absolute paths, links outside the tree and device files
+        tar.extractall(extract_dir, filter='data')
+
 
 class GitHubAnalyzer:
     """Main analyzer for GitHub repositories."""
@@ -26,6 +116,22 @@ class GitHubAnalyzer:
         
         start_time = time.time()
         
+        # The same repository at the same commit always analyzes the same way,
+        # so resolve HEAD with a single round trip before paying for a clone
+        head_sha = None
+        if Config.RESULT_CACHE_SIZE > 0:
+            head_sha = await self._resolve_head(repo_url)
+        cache_key = (repo_url, head_sha, bool(api_keys))
+        if head_sha:
+            cached = _result_cache.get(cache_key)
+            if cached and time.time() - cached[0] < Config.RESULT_CACHE_TTL:
+                _result_cache.move_to_end(cache_key)
+                # Report this run's own duration, not the original analysis'
+                return cached[1].model_copy(update={
+                    'analysis_time': time.time() - start_time,
+                    'cached': True
+                })
+        
         try:
             # Step 1: Clone repository
             repo_path = await self._clone_repository(repo_url)
@@ -37,19 +143,59 @@ class GitHubAnalyzer:
             llm_results = {}
             if api_keys and analyzed_files:
                 llm_processor = LLMProcessor(api_keys)
-                llm_results = await llm_processor.process_files(analyzed_files)
+                try:
+                    llm_results = await llm_processor.process_files(analyzed_files)
+                finally:
+                    await llm_processor.aclose()
             
             # Step 4: Compile results
             results = self._compile_results(
                 repo_url, analyzed_files, llm_results, start_time
             )
             
+            if head_sha:
+                _result_cache[cache_key] = (time.time(), results)
+                _result_cache.move_to_end(cache_key)
+                while len(_result_cache) > Config.RESULT_CACHE_SIZE:
+                    _result_cache.popitem(last=False)
+            
             return results
             
         finally:
-            # Cleanup
+            # Cleanup in the background so the caller gets results without
+            # waiting on one unlink per file of the checkout
             if self.temp_dir and os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                task = asyncio.create_task(
+                    asyncio.to_thread(shutil.rmtree, self.temp_dir, ignore_errors=True)
+                )
+                _cleanup_tasks.add(task)
+                task.add_done_callback(_cleanup_tasks.discard)
+    
+    async def _resolve_head(self, repo_url: str) -> Optional[str]:
+        """Return the commit sha HEAD points to, or None if it can't be resolved."""
+        
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                'git', 'ls-remote', repo_url, 'HEAD',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+            )
+        except OSError:
+            return None
+        
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=30)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return None
+        
+        if proc.returncode != 0:
+            return None
+        
+        sha, _, _ = stdout.decode('ascii', errors='ignore').partition('\t')
+        return sha.strip() or None
     
     async def _clone_repository(self, repo_url: str) -> str:
         """Clone the GitHub repository to a temporary directory."""
@@ -57,107 +203,220 @@ class GitHubAnalyzer:
         self.temp_dir = tempfile.mkdtemp(prefix="github_analysis_")
         
         try:
-            Repo.clone_from(repo_url, self.temp_dir)
-            return self.temp_dir
+            # Public GitHub repositories can be fetched as one tarball, which
+            # skips git protocol negotiation and never writes a .git directory
+            if urlparse(repo_url).hostname in ('github.com', 'www.github.com'):
+                repo_path = await self._fetch_tarball(repo_url)
+                if repo_path:
+                    return repo_path
+            
+            repo_path = os.path.join(self.temp_dir, 'repo')
+            
+            # Only the working tree is analyzed, so skip history and tags.
+            # The clone blocks on network I/O, so keep it off the event loop.
+            if pygit2 is not None:
+                clone = functools.partial(
+                    pygit2.clone_repository, repo_url, repo_path, depth=1
+                )
+            else:
+                clone = functools.partial(
+                    Repo.clone_from,
+                    repo_url,
+                    repo_path,
+                    depth=1,
+                    single_branch=True,
+                    no_tags=True,
+                    env={'GIT_TERMINAL_PROMPT': '0'}
+                )
+            
+            await asyncio.get_running_loop().run_in_executor(None, clone)
+            return repo_path
         except Exception as e:
             if self.temp_dir:
                 shutil.rmtree(self.temp_dir, ignore_errors=True)
             raise Exception(f"Failed to clone repository: {str(e)}")
     
+    async def _fetch_tarball(self, repo_url: str) -> Optional[str]:
+        """Download and extract the default branch of a GitHub repository.
+        
+        Returns the extracted repository root, or None when no tarball is
+        available (private or missing repository) so the caller can fall
+        back to a git clone.
+        """
+        
+        # Without the extraction filters (3.10 before 3.10.12, 3.11 before
+        # 3.11.4) the archive can't be unpacked safely, so let git check it out
+        if not hasattr(tarfile, 'data_filter'):
+            return None
+        
+        repo_info = self._extract_repo_info(repo_url)
+        url = f"https://codeload.github.com/{repo_info['owner']}/{repo_info['name']}/tar.gz/HEAD"
+        archive_path = os.path.join(self.temp_dir, 'repo.tar.gz')
+        extract_dir = os.path.join(self.temp_dir, 'tarball')
+        
+        try:
+            async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
+                async with client.stream('GET', url) as response:
+                    if response.status_code != 200:
+                        return None
+                    
+                    # Disk writes go through a worker thread so a slow disk
+                    # doesn't stall the event loop
+                    f = await asyncio.to_thread(open, archive_path, 'wb')
+                    try:
+                        async for chunk in response.aiter_bytes(1 << 20):
+                            await asyncio.to_thread(f.write, chunk)
+                    finally:
+                        await asyncio.to_thread(f.close)
+        except (httpx.HTTPError, OSError):
+            return None
+        
+        try:
+            await asyncio.to_thread(_extract_tarball, archive_path, extract_dir)
+        except (tarfile.TarError, OSError) as e:
+            # e.g. an absolute symlink rejected by the 'data' filter, or a
+            # truncated download; a git clone can still check the repo out
+            logger.warning("Could not extract tarball of %s: %s", repo_url, e)
+            await asyncio.to_thread(shutil.rmtree, extract_dir, ignore_errors=True)
+            return None
+        finally:
+            await asyncio.to_thread(os.remove, archive_path)
+        
+        # GitHub wraps the tree in a single "<repo>-<sha>" directory
+        entries = os.listdir(extract_dir)
+        if len(entries) == 1:
+            return os.path.join(extract_dir, entries[0])
+        
+        return extract_dir
+    
     async def _analyze_files(self, repo_path: str) -> List[Dict[str, Any]]:
         """Analyze all code files in the repository."""
         
         # Scan for code files
-        code_files = self._scan_code_files(repo_path)
+        code_files = await asyncio.to_thread(self._scan_code_files, repo_path)
         
         if not code_files:
             return []
         
-        # Analyze files in parallel
-        analyzed_files = []
-        
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            futures = []
-            
-            for file_path, content, language in code_files:
-                future = executor.submit(
-                    self.extractor.analyze_file,
-                    file_path, content, language
+        # Extraction is pure-Python regex work and holds the GIL, so spread
+        # it across processes rather than threads; the blocking map runs on
+        # a worker thread to keep the event loop free. A worker dying (e.g.
+        # OOM-killed) breaks the whole pool, so it is replaced and the run
+        # retried once before falling back to analyzing in this process.
+        results = None
+        for _ in range(2):
+            pool = _get_process_pool()
+            try:
+                results = await asyncio.to_thread(
+                    self.extractor.analyze_files, code_files, pool
                 )
-                futures.append(future)
-            
-            for future in futures:
-                try:
-                    file_analysis = future.result()
-                    if file_analysis:
-                        analyzed_files.append(file_analysis)
-                except Exception as e:
-                    print(f"Error analyzing file: {e}")
+                break
+            except BrokenProcessPool as e:
+                logger.warning("Process pool broke while analyzing files: %s", e)
+                _discard_process_pool(pool)
+        
+        if results is None:
+            results = await asyncio.to_thread(
+                lambda: [self.extractor.analyze_file(*item) for item in code_files]
+            )
+        
+        analyzed_files = [file_analysis for file_analysis in results if file_analysis]
         
         return analyzed_files
     
     def _scan_code_files(self, repo_path: str) -> List[tuple]:
-        """Scan repository for code files."""
+        """Scan repository for code files.
         
-        supported_extensions = {
-            '.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.cpp', '.c', 
-            '.go', '.rs', '.php', '.rb', '.cs', '.swift', '.kt'
-        }
+        The walk runs in the calling thread and hands batches of candidate
+        files to a pool of reader threads through a bounded queue, so
+        directory listing and file reads overlap.
+        """
         
-        code_files = []
+        prefix_len = len(os.path.join(repo_path, ''))
+        pending = queue.Queue(maxsize=_SCAN_READERS * 4)
+        scanned = []
         
-        for root, dirs, files in os.walk(repo_path):
-            # Skip common directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in [
-                'node_modules', '__pycache__', 'venv', 'env', 'build', 
-                'dist', 'target', '.git', 'vendor'
-            ]]
-            
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, repo_path)
-                ext = os.path.splitext(file)[1].lower()
+        def reader():
+            while True:
+                batch = pending.get()
+                if batch is None:
+                    return
                 
-                if ext in supported_extensions:
+                for index, entry, language in batch:
+                    rel_path = entry.path[prefix_len:]
+                    
                     try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()
-                        
-                        # Skip very large files
-                        if len(content) > 100000:  # 100KB limit
+                        # Skip very large files before reading them at all
+                        if entry.stat().st_size > Config.MAX_FILE_SIZE:
                             continue
                         
-                        language = self._detect_language(ext)
-                        code_files.append((rel_path, content, language))
+                        # Cap the read in case the file grew since the stat
+                        with open(entry.path, 'rb') as f:
+                            content = f.read(Config.MAX_FILE_SIZE).decode('utf-8', errors='ignore')
+                        
+                        scanned.append((index, rel_path, content, language))
                         
                     except Exception as e:
-                        print(f"Error reading {rel_path}: {e}")
-                        continue
+                        logger.warning("Error reading %s: %s", rel_path, e)
+        
+        readers = [threading.Thread(target=reader, daemon=True) for _ in range(_SCAN_READERS)]
+        for thread in readers:
+            thread.start()
+        
+        try:
+            batch = []
+            for index, (entry, language) in enumerate(self._iter_files(repo_path)):
+                batch.append((index, entry, language))
+                if len(batch) == _SCAN_BATCH_SIZE:
+                    pending.put(batch)
+                    batch = []
+            if batch:
+                pending.put(batch)
+        finally:
+            for _ in readers:
+                pending.put(None)
+            for thread in readers:
+                thread.join()
+        
+        # Readers finish out of order; restore walk order
+        scanned.sort(key=itemgetter(0))
+        return [(rel_path, content, language) for _, rel_path, content, language in scanned]
+    
+    def _iter_files(self, root: str) -> Iterator[Tuple[os.DirEntry, str]]:
+        """Walk the tree with os.scandir, yielding (entry, language) for supported files.
+        
+        Reuses the type information cached on each DirEntry instead of the
+        extra stat calls os.walk makes, and skips excluded directories
+        without descending into them.
+        """
         
-        return code_files
-    
-    def _detect_language(self, ext: str) -> str:
-        """Detect programming language from file extension."""
-        
-        lang_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.jsx': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.java': 'java',
-            '.cpp': 'cpp',
-            '.c': 'c',
-            '.go': 'go',
-            '.rs': 'rust',
-            '.php': 'php',
-            '.rb': 'ruby',
-            '.cs': 'csharp',
-            '.swift': 'swift',
-            '.kt': 'kotlin'
-        }
-        
-        return lang_map.get(ext, 'unknown')
+        stack = [root]
+        extensions = Config.SCANNED_EXTENSIONS
+        
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                # Unreadable or vanished directories are skipped, as os.walk does
+                continue
+            
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    
+                    if entry.is_dir(follow_symlinks=False):
+                        # Skip hidden and common dependency/build directories
+                        if not _EXCLUDED_DIR_RE.match(name):
+                            stack.append(entry.path)
+                        continue
+                    
+                    head, dot, tail = name.rpartition('.')
+                    if not head or not dot:
+                        continue
+                    
+                    language = extensions.get('.' + tail.lower())
+                    if language is not None and entry.is_file():
+                        yield entry, language
     
     def _compile_results(self, repo_url: str, analyzed_files: List[Dict], 
                         llm_results: Dict, start_time: float) -> AnalysisResult:
@@ -166,11 +425,18 @@ class GitHubAnalyzer:
         # Extract repository info
         repo_info = self._extract_repo_info(repo_url)
         
-        # Calculate statistics
-        backend_files = [f for f in analyzed_files if f.get('is_backend', False)]
-        total_apis = sum(f.get('api_count', 0) for f in analyzed_files)
-        total_functions = sum(f.get('function_count', 0) for f in analyzed_files)
-        languages = list(set(f.get('language') for f in analyzed_files if f.get('language')))
+        # Calculate statistics column by column: each field is pulled out of
+        # the per-file records once and reduced with C-level builtins, so the
+        # cost per file is a few dict lookups rather than a Python loop body.
+        # The per-language/purpose counts and dependency set are kept so doc
+        # generation doesn't have to walk the file list again.
+        backend_files = list(compress(analyzed_files, map(_get_is_backend, analyzed_files)))
+        total_apis = sum(map(_get_api_count, analyzed_files))
+        total_functions = sum(map(_get_function_count, analyzed_files))
+        languages = list(set(filter(None, map(_get_language, analyzed_files))))
+        dependencies = set(chain.from_iterable(map(_get_dependencies, analyzed_files)))
+        language_counts = Counter(map(_get_language, analyzed_files))
+        purpose_counts = Counter(map(_get_file_purpose, analyzed_files))
         
         return AnalysisResult(
             repository_url=repo_url,
@@ -181,7 +447,10 @@ class GitHubAnalyzer:
                 backend_files=len(backend_files),
                 total_apis=total_apis,
                 total_functions=total_functions,
-                languages=languages
+                languages=languages,
+                language_counts=language_counts,
+                purpose_counts=purpose_counts,
+                dependencies=dependencies
             ),
             all_files=analyzed_files,
             backend_files=backend_files,
@@ -1,30 +1,154 @@
 """Code extraction and analysis utilities."""
 
+import os
 import re
-from typing import Dict, Any, List, Optional
+import json
+import hashlib
+import logging
+import time
+from bisect import bisect_left
+from itertools import chain
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Substrings of the lowercased path / content that mark a backend file
+_BACKEND_PATH_INDICATORS = (
+    'api', 'server', 'backend', 'service', 'controller', 
+    'route', 'model', 'handler', 'middleware'
+)
+_BACKEND_CONTENT_INDICATORS = (
+    'fastapi', 'flask', 'express', 'django', 'spring',
+    '@app.route', 'app.get', 'app.post', 'router.',
+    'restcontroller', 'requestmapping', 'getmapping'
+)
+
+# Standard library modules left out of Python dependency lists
+_PY_STDLIB_SKIP = frozenset({
+    'os', 'sys', 'json', 're', 'time', 'datetime', 'typing',
+    'collections', 'itertools', 'functools', 'pathlib'
+})
+
+# Path substrings -> purpose, checked in order; the first hit wins
+_PATH_PURPOSES = (
+    (('test', 'spec'), 'Testing'),
+    (('config', 'setting'), 'Configuration'),
+    (('model', 'schema'), 'Data Model'),
+    (('service',), 'Business Logic'),
+    (('controller', 'route', 'handler'), 'API Controller'),
+    (('component',), 'UI Component'),
+    (('page',), 'Page Component'),
+    (('util', 'helper'), 'Utilities'),
+    (('middleware',), 'Middleware')
+)
+
+# Bump whenever analyze_file output changes so cached results are not reused
+_CACHE_VERSION = 3
+# Anchored to the backend directory so worker processes agree on it
+# whatever their working directory
+_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    Config.TEMP_DIR, 'extract_cache'
+)
+_DISK_CACHE_MAX_ENTRIES = 50000
+_DISK_CACHE_MAX_AGE = 7 * 24 * 60 * 60  # 7 days since last use
+_MEMORY_CACHE_SIZE = 1024
+
+# Function definitions
+_PY_FUNC_RE = re.compile(r'^\s*def\s+(\w+)\s*\(([^)]*)\)\s*(?:->\s*([^:]+))?:', re.MULTILINE)
+_JS_FUNC_RE = re.compile(r'function\s+(\w+)\s*\(([^)]*)\)')
+# `name = function (...)` and `name = (...) =>` in one scan, since they share
+# the costly `(\w+)\s*=` prefix. The lookahead keeps the match zero-width so
+# both forms can still be found inside each other's text; group 1 spans the
+# whole declaration, group 3 holds function-expression parameters and group 4
+# arrow-function parameters.
+_JS_ASSIGNED_FUNC_RE = re.compile(
+    r'\b(?=((\w+)\s*=\s*(?:function\s*\(([^)]*)\)|\(([^)]*)\)\s*=>)))'
+)
+_JS_ASYNC_FUNC_RE = re.compile(r'async\s+function\s+(\w+)\s*\(([^)]*)\)')
+_JAVA_METHOD_RE = re.compile(r'(public|private|protected)\s+(?:static\s+)?(?:\w+\s+)*(\w+)\s*\(([^)]*)\)')
+
+# API route declarations
+_FLASK_RE = re.compile(
+    r'@app\.route\s*\(\s*["\']([^"\']+)["\'](?:[^)]*methods\s*=\s*\[([^\]]+)\])?', re.IGNORECASE
+)
+# Kept as separate scans: the leading literal `@` lets the FastAPI scan
+# jump straight to candidate decorators, which an optional `(@)?` defeats
+_FASTAPI_RE = re.compile(
+    r'@(?:app|router)\.(get|post|put|delete|patch)\s*\(\s*["\']([^"\']+)["\']', re.IGNORECASE
+)
+_EXPRESS_RE = re.compile(
+    r'(?:app|router)\.(get|post|put|delete|patch)\s*\(\s*["\']([^"\']+)["\']', re.IGNORECASE
+)
+
+# Import statements
+_PY_IMPORT_RE = re.compile(r'^(?:from|import)\s+(\w+)', re.MULTILINE)
+_JS_IMPORT_RES = (
+    re.compile(r'import.*from\s+["\']([^"\']+)["\']'),
+    re.compile(r'require\s*\(\s*["\']([^"\']+)["\']\)')
+)
+_JAVA_IMPORT_RE = re.compile(r'^import\s+([\w.]+);', re.MULTILINE)
+
+_NEWLINE_RE = re.compile('\n')
+# First non-whitespace character of each line that has one
+_NONBLANK_LINE_RE = re.compile(r'^[^\S\n]*\S', re.MULTILINE)
 
 
 class CodeExtractor:
     """Extract code information from files."""
     
+    def analyze_files(self, items: List[Tuple[str, str, str]],
+                      executor: Optional[Executor] = None) -> List[Optional[Dict[str, Any]]]:
+        """Analyze (file_path, content, language) items across worker processes.
+        
+        Results come back in input order. Items are sent to the workers in
+        chunks so many small files share one round trip. When no executor is
+        given, a pool sized to the machine is created for this call.
+        """
+        
+        if not items:
+            return []
+        
+        workers = os.cpu_count() or 1
+        chunksize = max(1, len(items) // (4 * workers))
+        
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_analyze_item, items, chunksize=chunksize))
+        
+        return list(executor.map(_analyze_item, items, chunksize=chunksize))
+    
     def analyze_file(self, file_path: str, content: str, language: str) -> Dict[str, Any]:
         """Analyze a single code file."""
         
         try:
             # Basic metrics
-            lines_of_code = len([line for line in content.split('\n') if line.strip()])
+            lines_of_code = len(_NONBLANK_LINE_RE.findall(content))
+            
+            # Offsets of every newline, so a match's line number is a binary
+            # search instead of counting newlines in everything before it
+            newline_offsets = [m.start() for m in _NEWLINE_RE.finditer(content)]
             
             # Extract functions
-            functions = self._extract_functions(content, language)
+            functions = self._extract_functions(content, language, newline_offsets)
             
             # Extract API endpoints
-            api_endpoints = self._extract_api_endpoints(content, language)
+            api_endpoints = self._extract_api_endpoints(content, language, newline_offsets)
+            
+            # Lowercase once for both classifiers; a lowered copy plus plain
+            # substring checks is far cheaper than case-insensitive regexes
+            path_lower = file_path.lower()
+            content_lower = content.lower()
             
             # Determine if backend file
-            is_backend = self._is_backend_file(file_path, content)
+            is_backend = self._is_backend_file(path_lower, content_lower)
             
             # Determine file purpose
-            file_purpose = self._determine_file_purpose(file_path, content)
+            file_purpose = self._determine_file_purpose(path_lower, content_lower)
             
             # Extract dependencies
             dependencies = self._extract_dependencies(content, language)
@@ -40,22 +164,21 @@ class CodeExtractor:
                 'is_backend': is_backend,
                 'file_purpose': file_purpose,
                 'dependencies': dependencies,
-                'content_preview': content[:1000] if len(content) > 1000 else content
+                'content_preview': content[:1000]
             }
             
         except Exception as e:
-            print(f"Error analyzing {file_path}: {e}")
+            logger.warning("Error analyzing %s: %s", file_path, e)
             return None
     
-    def _extract_functions(self, content: str, language: str) -> List[Dict[str, Any]]:
+    def _extract_functions(self, content: str, language: str,
+                           newline_offsets: List[int]) -> List[Dict[str, Any]]:
         """Extract function definitions from code."""
         
         functions = []
         
         if language == 'python':
-            # Python function pattern
-            pattern = r'^\\s*def\\s+(\\w+)\\s*\\(([^)]*)\\)\\s*(?:->\\s*([^:]+))?:'
-            matches = re.finditer(pattern, content, re.MULTILINE)
+            matches = _PY_FUNC_RE.finditer(content)
             
             for match in matches:
                 func_name = match.group(1)
@@ -66,35 +189,47 @@ class CodeExtractor:
                     'name': func_name,
                     'parameters': params,
                     'return_type': return_type,
-                    'line': content[:match.start()].count('\n') + 1
+                    'line': bisect_left(newline_offsets, match.start()) + 1
                 })
         
         elif language in ['javascript', 'typescript']:
-            # JavaScript/TypeScript function patterns
-            patterns = [
-                r'function\\s+(\\w+)\\s*\\(([^)]*)\\)',
-                r'(\\w+)\\s*=\\s*function\\s*\\(([^)]*)\\)',
-                r'(\\w+)\\s*=\\s*\\(([^)]*)\\)\\s*=>',
-                r'async\\s+function\\s+(\\w+)\\s*\\(([^)]*)\\)'
-            ]
+            # Split the assigned forms back apart; a match starting inside
+            # the previous match of its own form is skipped, as a separate
+            # finditer over that form would never see it
+            expressions = []
+            arrows = []
+            expression_end = arrow_end = 0
             
-            for pattern in patterns:
-                matches = re.finditer(pattern, content)
-                for match in matches:
-                    func_name = match.group(1)
-                    params = [p.strip() for p in match.group(2).split(',') if p.strip()]
-                    
-                    functions.append({
-                        'name': func_name,
-                        'parameters': params,
-                        'return_type': None,
-                        'line': content[:match.start()].count('\n') + 1
-                    })
+            for match in _JS_ASSIGNED_FUNC_RE.finditer(content):
+                start = match.start()
+                
+                if match.group(3) is not None:
+                    if start >= expression_end:
+                        expressions.append((start, match.group(2), match.group(3)))
+                        expression_end = match.end(1)
+                elif start >= arrow_end:
+                    arrows.append((start, match.group(2), match.group(4)))
+                    arrow_end = match.end(1)
+            
+            declarations = chain(
+                ((m.start(), m.group(1), m.group(2)) for m in _JS_FUNC_RE.finditer(content)),
+                expressions,
+                arrows,
+                ((m.start(), m.group(1), m.group(2)) for m in _JS_ASYNC_FUNC_RE.finditer(content))
+            )
+            
+            for start, func_name, params_str in declarations:
+                params = [p.strip() for p in params_str.split(',') if p.strip()]
+                
+                functions.append({
+                    'name': func_name,
+                    'parameters': params,
+                    'return_type': None,
+                    'line': bisect_left(newline_offsets, start) + 1
+                })
         
         elif language == 'java':
-            # Java method pattern
-            pattern = r'(public|private|protected)\\s+(?:static\\s+)?(?:\\w+\\s+)*(\\w+)\\s*\\(([^)]*)\\)'
-            matches = re.finditer(pattern, content)
+            matches = _JAVA_METHOD_RE.finditer(content)
             
             for match in matches:
                 func_name = match.group(2)
@@ -104,19 +239,19 @@ class CodeExtractor:
                     'name': func_name,
                     'parameters': params,
                     'return_type': None,
-                    'line': content[:match.start()].count('\n') + 1
+                    'line': bisect_left(newline_offsets, match.start()) + 1
                 })
         
         return functions
     
-    def _extract_api_endpoints(self, content: str, language: str) -> List[Dict[str, Any]]:
+    def _extract_api_endpoints(self, content: str, language: str,
+                               newline_offsets: List[int]) -> List[Dict[str, Any]]:
         """Extract API endpoint definitions."""
         
         endpoints = []
         
         # Flask routes
-        flask_pattern = r'@app\\.route\\s*\\(\\s*["\']([^"\']+)["\'](?:[^)]*methods\\s*=\\s*\\[([^\\]]+)\\])?'
-        matches = re.finditer(flask_pattern, content, re.IGNORECASE)
+        matches = _FLASK_RE.finditer(content)
         
         for match in matches:
             path = match.group(1)
@@ -131,91 +266,49 @@ class CodeExtractor:
                     'method': method.upper(),
                     'path': path,
                     'framework': 'Flask',
-                    'line': content[:match.start()].count('\n') + 1
+                    'line': bisect_left(newline_offsets, match.start()) + 1
                 })
         
         # FastAPI routes
-        fastapi_pattern = r'@(?:app|router)\\.(get|post|put|delete|patch)\\s*\\(\\s*["\']([^"\']+)["\']'
-        matches = re.finditer(fastapi_pattern, content, re.IGNORECASE)
-        
-        for match in matches:
-            method = match.group(1).upper()
-            path = match.group(2)
-            
+        for match in _FASTAPI_RE.finditer(content):
             endpoints.append({
-                'method': method,
-                'path': path,
+                'method': match.group(1).upper(),
+                'path': match.group(2),
                 'framework': 'FastAPI',
-                'line': content[:match.start()].count('\n') + 1
+                'line': bisect_left(newline_offsets, match.start()) + 1
             })
         
         # Express.js routes
-        express_pattern = r'(?:app|router)\\.(get|post|put|delete|patch)\\s*\\(\\s*["\']([^"\']+)["\']'
-        matches = re.finditer(express_pattern, content, re.IGNORECASE)
-        
-        for match in matches:
-            method = match.group(1).upper()
-            path = match.group(2)
-            
+        for match in _EXPRESS_RE.finditer(content):
             endpoints.append({
-                'method': method,
-                'path': path,
+                'method': match.group(1).upper(),
+                'path': match.group(2),
                 'framework': 'Express',
-                'line': content[:match.start()].count('\n') + 1
+                'line': bisect_left(newline_offsets, match.start()) + 1
             })
         
         return endpoints
     
-    def _is_backend_file(self, file_path: str, content: str) -> bool:
-        """Determine if file is backend-related."""
+    def _is_backend_file(self, path_lower: str, content_lower: str) -> bool:
+        """Determine if file is backend-related from its lowercased path and content."""
         
         # Check file path indicators
-        backend_path_indicators = [
-            'api', 'server', 'backend', 'service', 'controller', 
-            'route', 'model', 'handler', 'middleware'
-        ]
-        
-        path_lower = file_path.lower()
-        if any(indicator in path_lower for indicator in backend_path_indicators):
+        if any(indicator in path_lower for indicator in _BACKEND_PATH_INDICATORS):
             return True
         
         # Check content indicators
-        backend_content_indicators = [
-            'fastapi', 'flask', 'express', 'django', 'spring',
-            '@app.route', 'app.get', 'app.post', 'router.',
-            'RestController', 'RequestMapping', 'GetMapping'
-        ]
-        
-        content_lower = content.lower()
-        return any(indicator in content_lower for indicator in backend_content_indicators)
+        return any(indicator in content_lower for indicator in _BACKEND_CONTENT_INDICATORS)
     
-    def _determine_file_purpose(self, file_path: str, content: str) -> str:
-        """Determine the main purpose of the file."""
-        
-        path_lower = file_path.lower()
+    def _determine_file_purpose(self, path_lower: str, content_lower: str) -> str:
+        """Determine the main purpose of the file from its lowercased path and content."""
         
         # Check path patterns
-        if 'test' in path_lower or 'spec' in path_lower:
-            return 'Testing'
-        elif 'config' in path_lower or 'setting' in path_lower:
-            return 'Configuration'
-        elif 'model' in path_lower or 'schema' in path_lower:
-            return 'Data Model'
-        elif 'service' in path_lower:
-            return 'Business Logic'
-        elif 'controller' in path_lower or 'route' in path_lower or 'handler' in path_lower:
-            return 'API Controller'
-        elif 'component' in path_lower:
-            return 'UI Component'
-        elif 'page' in path_lower:
-            return 'Page Component'
-        elif 'util' in path_lower or 'helper' in path_lower:
-            return 'Utilities'
-        elif 'middleware' in path_lower:
-            return 'Middleware'
+        for needles, purpose in _PATH_PURPOSES:
+            for needle in needles:
+                if needle in path_lower:
+                    return purpose
         
         # Check content patterns
-        content_lower = content.lower()
         if 'class.*test' in content_lower or 'def test_' in content_lower:
             return 'Testing'
         elif '@app.route' in content_lower or 'app.get' in content_lower:
@@ -228,44 +321,132 @@ class CodeExtractor:
     def _extract_dependencies(self, content: str, language: str) -> List[str]:
         """Extract dependencies from file content."""
         
-        dependencies = []
+        # Keys of an insertion-ordered dict: deduplicated as they are found,
+        # in first-seen order so the generated docs are stable across runs
+        dependencies: Dict[str, None] = {}
         
         if language == 'python':
             # Python imports
-            import_patterns = [
-                r'^from\\s+(\\w+)',
-                r'^import\\s+(\\w+)'
-            ]
-            
-            for pattern in import_patterns:
-                matches = re.finditer(pattern, content, re.MULTILINE)
-                for match in matches:
-                    dep = match.group(1)
-                    if dep not in ['os', 'sys', 'json', 're', 'time', 'datetime']:
-                        dependencies.append(dep)
+            matches = _PY_IMPORT_RE.finditer(content)
+            for match in matches:
+                dep = match.group(1)
+                if dep not in _PY_STDLIB_SKIP:
+                    dependencies.setdefault(dep)
         
         elif language in ['javascript', 'typescript']:
             # JavaScript/TypeScript imports
-            patterns = [
-                r'import.*from\\s+["\']([^"\']+)["\']',
-                r'require\\s*\\(\\s*["\']([^"\']+)["\']\\)'
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, content)
+            for pattern in _JS_IMPORT_RES:
+                matches = pattern.finditer(content)
                 for match in matches:
                     dep = match.group(1)
-                    if not dep.startswith('.') and not dep.startswith('/'):
-                        dependencies.append(dep.split('/')[0])
+                    # The pattern never captures an empty string
+                    if dep[0] not in './':
+                        dependencies.setdefault(dep.partition('/')[0])
         
         elif language == 'java':
             # Java imports
-            pattern = r'^import\\s+([\\w.]+);'
-            matches = re.finditer(pattern, content, re.MULTILINE)
+            matches = _JAVA_IMPORT_RE.finditer(content)
             
             for match in matches:
                 dep = match.group(1)
                 if not dep.startswith('java.'):
-                    dependencies.append(dep.split('.')[0])
+                    dependencies.setdefault(dep.partition('.')[0])
         
-        return list(set(dependencies))  # Remove duplicates
\ No newline at end of file
+        return list(dependencies)
+
+
+# Per-process instance used by worker processes; the extractor holds no state
+_worker_extractor = CodeExtractor()
+
+
+# digest -> analysis, least recently used first
+_memory_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+def _analyze_item(item: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+    """Process pool entry point for CodeExtractor.analyze_files.
+    
+    analyze_file is a pure function of its arguments, so results are
+    memoized by a digest of them: in memory for repeats within a worker and
+    on disk for repeats across runs and processes.
+    """
+    
+    file_path, content, language = item
+    
+    digest = hashlib.blake2b(
+        f"{_CACHE_VERSION}\0{language}\0{file_path}\0".encode() + content.encode(),
+        digest_size=20
+    ).hexdigest()
+    
+    result = _memory_cache.get(digest)
+    if result is not None:
+        _memory_cache.move_to_end(digest)
+        return result
+    
+    cache_path = os.path.join(_CACHE_DIR, digest[:2], digest + '.json')
+    
+    try:
+        with open(cache_path, 'rb') as f:
+            result = json.loads(f.read())
+        # Mark the entry as used so pruning removes the stalest ones first
+        os.utime(cache_path)
+    except (OSError, ValueError):
+        result = _worker_extractor.analyze_file(file_path, content, language)
+        
+        if result is None:
+            return None
+        
+        try:
+            # Write then rename so concurrent workers never read a partial file
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    
+    _memory_cache[digest] = result
+    if len(_memory_cache) > _MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+    
+    return result
+
+
+def prune_extract_cache() -> None:
+    """Bound the on-disk analysis cache.
+    
+    Entries unused for _DISK_CACHE_MAX_AGE are removed, then the least
+    recently used ones until at most _DISK_CACHE_MAX_ENTRIES remain.
+    """
+    
+    cutoff = time.time() - _DISK_CACHE_MAX_AGE
+    entries = []
+    
+    try:
+        shards = [entry.path for entry in os.scandir(_CACHE_DIR) if entry.is_dir()]
+    except OSError:
+        return
+    
+    for shard in shards:
+        try:
+            with os.scandir(shard) as files:
+                for entry in files:
+                    try:
+                        mtime = entry.stat().st_mtime
+                        if mtime < cutoff:
+                            os.remove(entry.path)
+                        else:
+                            entries.append((mtime, entry.path))
+                    except OSError:
+                        pass
+        except OSError:
+            continue
+    
+    if len(entries) > _DISK_CACHE_MAX_ENTRIES:
+        entries.sort()
+        for _, path in entries[:len(entries) - _DISK_CACHE_MAX_ENTRIES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -1,57 +1,89 @@
 """LLM processing for enhanced documentation generation."""
 
 import asyncio
+import heapq
+import json
 import httpx
 import time
 import random
 from typing import Dict, Any, List, Optional
 
 
+# Path fragments that mark likely entry points and request handlers
+_ENTRY_POINT_NAMES = ('main', 'app', 'server', 'index')
+_HANDLER_NAMES = ('controller', 'service', 'handler', 'route')
+
+
 class RateLimiter:
-    """Simple rate limiter for API calls."""
+    """Hands out API keys so each is used at most max_requests_per_minute times a minute.
+    
+    Ready keys wait in a queue. A task takes one with acquire(), makes its
+    request, and hands it back with release(); the key only re-enters the
+    queue once its spacing has elapsed, so every key can have a request in
+    flight at the same time without any caller sleeping.
+    """
     
     def __init__(self, api_keys: List[str]):
         self.api_keys = api_keys
-        self.current_key_index = 0
-        self.key_usage = {key: {'requests': 0, 'last_reset': time.time()} for key in api_keys}
         self.max_requests_per_minute = 15  # Conservative limit
+        self.interval = 60 / self.max_requests_per_minute
+        self._ready: asyncio.Queue = asyncio.Queue()
+        for key in api_keys:
+            self._ready.put_nowait(key)
     
-    def get_available_key(self) -> Optional[str]:
-        """Get an available API key."""
+    async def acquire(self) -> str:
+        """Wait until a key is ready and take it."""
         
-        now = time.time()
+        return await self._ready.get()
+    
+    def release_after(self, key: str, delay: float):
+        """Make a key available again after delay seconds."""
         
-        for _ in range(len(self.api_keys)):
-            key = self.api_keys[self.current_key_index]
-            self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-            
-            usage = self.key_usage[key]
-            
-            # Reset if minute passed
-            if now - usage['last_reset'] >= 60:
-                usage['requests'] = 0
-                usage['last_reset'] = now
-            
-            # Check if key has capacity
-            if usage['requests'] < self.max_requests_per_minute:
-                usage['requests'] += 1
-                return key
+        asyncio.get_running_loop().call_later(delay, self._ready.put_nowait, key)
+    
+    def release(self, key: str):
+        """Return a key after a successful request."""
         
-        return None
+        self.release_after(key, self.interval)
     
     def record_error(self, key: str):
-        """Record an error for a key."""
-        if key in self.key_usage:
-            # Temporarily reduce capacity for this key
-            self.key_usage[key]['requests'] += 5
+        """Return a key after a failed request, with a longer cooldown."""
+        
+        self.release_after(key, self.interval * 5)
 
 
 class LLMProcessor:
     """Process files with LLM for enhanced documentation."""
     
+    # Files described per request; each request pays a fixed model latency
+    batch_size = 3
+    
     def __init__(self, api_keys: List[str]):
         self.api_keys = api_keys
         self.rate_limiter = RateLimiter(api_keys)
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use.
+        
+        Every call goes to the same host, so keeping one pooled client saves
+        a TCP and TLS handshake per request.
+        """
+        
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=8)
+            )
+        
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def process_files(self, analyzed_files: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Process files with LLM for enhanced documentation."""
@@ -64,32 +96,41 @@ class LLMProcessor:
         
         print(f"🤖 Processing {len(important_files)} files with LLM...")
         
+        # Describe several files per request and run the batches
+        # concurrently; each key serves one request at a time
+        batches = [
+            important_files[i:i + self.batch_size]
+            for i in range(0, len(important_files), self.batch_size)
+        ]
+        semaphore = asyncio.Semaphore(min(len(self.api_keys) * 2, 5))
+        
+        async def process(batch: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            async with semaphore:
+                return await self._process_batch(batch)
+        
+        outcomes = await asyncio.gather(
+            *(process(batch) for batch in batches),
+            return_exceptions=True
+        )
+        
         results = {}
         
-        for file_info in important_files:
-            try:
-                # Process file with LLM
-                analysis = await self._process_single_file(file_info)
-                
-                if analysis:
-                    results[file_info['file_path']] = analysis
-                    print(f"✅ LLM analysis completed: {file_info['file_path']}")
-                
-                # Wait between requests to avoid rate limits
-                await asyncio.sleep(3)
+        for batch, outcome in zip(batches, outcomes):
+            for file_info in batch:
+                file_path = file_info['file_path']
                 
-            except Exception as e:
-                print(f"❌ LLM processing failed for {file_info['file_path']}: {e}")
-                continue
+                if isinstance(outcome, Exception):
+                    print(f"❌ LLM processing failed for {file_path}: {outcome}")
+                elif file_path in outcome:
+                    results[file_path] = outcome[file_path]
+                    print(f"✅ LLM analysis completed: {file_path}")
         
         return results
     
     def _select_important_files(self, analyzed_files: List[Dict], max_files: int = 5) -> List[Dict]:
         """Select the most important files for LLM processing."""
         
-        scored_files = []
-        
-        for file_info in analyzed_files:
+        def importance(file_info: Dict) -> int:
             score = 0
             
             # API endpoints are very important
@@ -104,28 +145,89 @@ class LLMProcessor:
             
             # Main files are important
             file_path = file_info['file_path'].lower()
-            if any(name in file_path for name in ['main', 'app', 'server', 'index']):
+            if any(name in file_path for name in _ENTRY_POINT_NAMES):
                 score += 20
             
             # Controller/service files are important
-            if any(name in file_path for name in ['controller', 'service', 'handler', 'route']):
+            if any(name in file_path for name in _HANDLER_NAMES):
                 score += 15
             
-            scored_files.append((score, file_info))
+            return score
+        
+        # Only the top few are needed, so keep a bounded heap instead of
+        # sorting every file; ties keep their original order as before
+        return heapq.nlargest(max_files, analyzed_files, key=importance)
+    
+    async def _process_batch(self, files: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Describe several files with one LLM request.
+        
+        Files the model leaves out of its answer, or a whole batch whose
+        request fails or whose answer isn't valid JSON, fall back to one
+        request per file; a file whose own request fails is left out.
+        """
+        
+        if len(files) == 1:
+            analysis = await self._process_single_file(files[0])
+            return {files[0]['file_path']: analysis} if analysis else {}
+        
+        # Wait for a ready API key
+        api_key = await self.rate_limiter.acquire()
+        
+        try:
+            prompt = self._create_batch_prompt(files)
+            result = await self._call_llm_api(
+                api_key, prompt, max_tokens=300 * len(files), json_mode=True
+            )
+        except Exception as e:
+            self.rate_limiter.record_error(api_key)
+            print(f"⚠️ Batch LLM request failed, describing files one by one: {e}")
+            result = None
+        else:
+            self.rate_limiter.release(api_key)
+        
+        descriptions = {}
+        try:
+            for entry in json.loads(result or '{}').get('files', []):
+                if entry.get('path') and entry.get('description'):
+                    descriptions[entry['path']] = str(entry['description']).strip()
+        except (ValueError, AttributeError):
+            pass
+        
+        results = {}
+        
+        for file_info in files:
+            description = descriptions.get(file_info['file_path'])
+            
+            if description:
+                results[file_info['file_path']] = self._build_analysis(file_info, description)
+            else:
+                try:
+                    analysis = await self._process_single_file(file_info)
+                except Exception as e:
+                    print(f"❌ LLM processing failed for {file_info['file_path']}: {e}")
+                    continue
+                
+                if analysis:
+                    results[file_info['file_path']] = analysis
         
-        # Sort by score and take top files
-        scored_files.sort(key=lambda x: x[0], reverse=True)
-        return [file_info for _, file_info in scored_files[:max_files]]
+        return results
+    
+    def _build_analysis(self, file_info: Dict[str, Any], description: str) -> Dict[str, Any]:
+        """Wrap an LLM description with the file's own statistics."""
+        
+        return {
+            'description': description,
+            'timestamp': time.time(),
+            'file_purpose': file_info.get('file_purpose', 'Unknown'),
+            'api_count': file_info.get('api_count', 0),
+            'function_count': file_info.get('function_count', 0)
+        }
     
     async def _process_single_file(self, file_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a single file with LLM."""
         
-        # Get available API key
-        api_key = self.rate_limiter.get_available_key()
-        
-        if not api_key:
-            print(f"⏳ No API keys available for {file_info['file_path']}")
-            return None
+        # Wait for a ready API key
+        api_key = await self.rate_limiter.acquire()
         
         try:
             # Create analysis prompt
@@ -134,25 +236,21 @@ class LLMProcessor:
             # Call LLM API
             result = await self._call_llm_api(api_key, prompt)
             
-            if result:
-                return {
-                    'description': result,
-                    'timestamp': time.time(),
-                    'file_purpose': file_info.get('file_purpose', 'Unknown'),
-                    'api_count': file_info.get('api_count', 0),
-                    'function_count': file_info.get('function_count', 0)
-                }
-            
-            return None
-            
         except Exception as e:
             self.rate_limiter.record_error(api_key)
             raise e
+        
+        self.rate_limiter.release(api_key)
+        
+        if result:
+            return self._build_analysis(file_info, result)
+        
+        return None
     
     def _create_analysis_prompt(self, file_info: Dict[str, Any]) -> str:
         """Create analysis prompt for LLM."""
         
-        content = file_info.get('content_preview', '')[:800]  # Limit content size
+        content = file_info['content_preview'][:800]  # Limit content size
         
         prompt = f"""Analyze this {file_info['language']} code file and provide a comprehensive description:
 
@@ -174,7 +272,39 @@ Keep the response concise and focused on the main functionality."""
         
         return prompt
     
-    async def _call_llm_api(self, api_key: str, prompt: str, max_retries: int = 2) -> Optional[str]:
+    def _create_batch_prompt(self, files: List[Dict[str, Any]]) -> str:
+        """Create one prompt asking for a JSON description of every file."""
+        
+        sections = []
+        for file_info in files:
+            content = file_info['content_preview'][:800]  # Limit content size
+            sections.append(f"""File: {file_info['file_path']}
+Language: {file_info['language']}
+Purpose: {file_info.get('file_purpose', 'Unknown')}
+Functions: {file_info.get('function_count', 0)}
+API Endpoints: {file_info.get('api_count', 0)}
+Backend File: {file_info.get('is_backend', False)}
+
+Code Preview:
+{content}""")
+        
+        files_text = "\n\n---\n\n".join(sections)
+        
+        prompt = f"""Analyze the following {len(files)} code files. For each file provide:
+1. A brief description of what this file does (2-3 sentences)
+2. Key functionality and responsibilities
+3. How it fits into the overall application architecture
+
+Keep each description concise and focused on the main functionality.
+
+Respond with a JSON object of the form {{"files": [{{"path": "<file path>", "description": "<description>"}}]}} containing one entry per file, using the file paths exactly as given.
+
+{files_text}"""
+        
+        return prompt
+    
+    async def _call_llm_api(self, api_key: str, prompt: str, max_retries: int = 2,
+                            max_tokens: int = 300, json_mode: bool = False) -> Optional[str]:
         """Call Groq LLM API."""
         
         url = "https://api.groq.com/openai/v1/chat/completions"
@@ -188,34 +318,36 @@ Keep the response concise and focused on the main functionality."""
             "messages": [
                 {"role": "user", "content": prompt}
             ],
-            "max_tokens": 300,
+            "max_tokens": max_tokens,
             "temperature": 0.3
         }
         
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.post(url, headers=headers, json=payload)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        return result['choices'][0]['message']['content'].strip()
+                response = await self._get_client().post(url, headers=headers, json=payload)
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    return result['choices'][0]['message']['content'].strip()
+                
+                elif response.status_code == 429:
+                    # Rate limit error
+                    error_text = response.text
+                    print(f"⏳ Rate limit hit: {error_text[:100]}...")
                     
-                    elif response.status_code == 429:
-                        # Rate limit error
-                        error_text = response.text
-                        print(f"⏳ Rate limit hit: {error_text[:100]}...")
-                        
-                        if attempt < max_retries - 1:
-                            wait_time = 10 + (attempt * 5)
-                            await asyncio.sleep(wait_time)
-                            continue
-                        
-                        raise Exception(f"Rate limit error: {response.status_code}")
+                    if attempt < max_retries - 1:
+                        wait_time = 10 + (attempt * 5)
+                        await asyncio.sleep(wait_time)
+                        continue
                     
-                    else:
-                        error_text = response.text
-                        raise Exception(f"API error {response.status_code}: {error_text[:100]}")
+                    raise Exception(f"Rate limit error: {response.status_code}")
+                
+                else:
+                    error_text = response.text
+                    raise Exception(f"API error {response.status_code}: {error_text[:100]}")
             
             except httpx.TimeoutException:
                 if attempt < max_retries - 1:
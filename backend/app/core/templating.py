@@ -0,0 +1,15 @@
+"""Jinja environment shared by the documentation generators."""
+
+from pathlib import Path
+from jinja2 import Environment, FileSystemLoader
+
+
+# Templates are compiled once at import and never re-checked on disk
+TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(str(Path(__file__).parent / 'templates')),
+    auto_reload=False,
+    cache_size=400,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True
+)
@@ -0,0 +1,31 @@
+"""HTTP helpers shared by the API routes and static file mounts."""
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header value allows a gzip response.
+    
+    Codings are matched as whole tokens with their q-values, so "gzip;q=0"
+    refuses gzip; "*" covers gzip when it isn't listed itself.
+    """
+    wildcard_q = None
+    
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.partition(';')
+        name = name.strip().lower()
+        if name not in ('gzip', '*'):
+            continue
+        
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        
+        if name == 'gzip':
+            return q > 0
+        wildcard_q = q
+    
+    return wildcard_q is not None and wildcard_q > 0
@@ -1,9 +1,13 @@
 """Data models for the documentation generator."""
 
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, HttpUrl
+from typing import List, Dict, Any, Optional, Set
+from pydantic import BaseModel, ConfigDict, HttpUrl
 from enum import Enum
 
+# Models are built once and never mutated, so skip assignment validation
+# and ignore unknown fields instead of storing them
+_MODEL_CONFIG = ConfigDict(frozen=True, validate_assignment=False, extra='ignore')
+
 class AnalysisStatus(str, Enum):
     """Analysis status enumeration."""
     PENDING = "pending"
@@ -13,15 +17,18 @@ class AnalysisStatus(str, Enum):
 
 class GitHubRequest(BaseModel):
     """Request model for GitHub repository analysis."""
+    model_config = _MODEL_CONFIG
     github_url: HttpUrl
     groq_api_keys: Optional[List[str]] = None
 
 class UploadRequest(BaseModel):
     """Request model for file upload analysis."""
+    model_config = _MODEL_CONFIG
     groq_api_keys: Optional[List[str]] = None
 
 class AnalysisResponse(BaseModel):
     """Response model for analysis results."""
+    model_config = _MODEL_CONFIG
     analysis_id: str
     status: AnalysisStatus
     message: str
@@ -31,6 +38,7 @@ class AnalysisResponse(BaseModel):
 
 class FileAnalysis(BaseModel):
     """Model for individual file analysis."""
+    model_config = _MODEL_CONFIG
     file_path: str
     language: str
     lines_of_code: int
@@ -42,6 +50,7 @@ class FileAnalysis(BaseModel):
 
 class ProjectSummary(BaseModel):
     """Model for project analysis summary."""
+    model_config = _MODEL_CONFIG
     total_files: int
     backend_files: int
     total_apis: int
@@ -51,6 +60,7 @@ class ProjectSummary(BaseModel):
 
 class AnalysisResults(BaseModel):
     """Complete analysis results model."""
+    model_config = _MODEL_CONFIG
     analysis_id: str
     repository_url: str
     repository_info: Dict[str, Any]
@@ -59,4 +69,29 @@ class AnalysisResults(BaseModel):
     all_files: List[FileAnalysis]
     output_directory: str
     documentation_files: List[str]
-    created_at: str
\ No newline at end of file
+    created_at: str
+
+class FileSummary(BaseModel):
+    """Aggregate statistics computed once by the core analyzer."""
+    model_config = _MODEL_CONFIG
+    total_files: int
+    backend_files: int
+    total_apis: int
+    total_functions: int
+    languages: List[str]
+    language_counts: Dict[str, int] = {}
+    purpose_counts: Dict[str, int] = {}
+    dependencies: Set[str] = set()
+
+class AnalysisResult(BaseModel):
+    """Result of a core analyzer run, consumed by the documentation generators."""
+    model_config = _MODEL_CONFIG
+    repository_url: str
+    repository_info: Dict[str, str]
+    analysis_time: float
+    summary: FileSummary
+    all_files: List[Dict[str, Any]]
+    backend_files: List[Dict[str, Any]]
+    llm_analysis: Dict[str, Any] = {}
+    # Set when the result was reused from an earlier run of the same commit
+    cached: bool = False
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request, Response
+from fastapi.responses import FileResponse
 from typing import List, Optional
 import os
+import re
 import zipfile
 import tempfile
 import shutil
@@ -8,10 +10,23 @@ import shutil
 from ..models import GitHubRequest, AnalysisResponse, AnalysisStatus
 from ..services.analysis_service import analysis_service
 from ..config import Config
+from ..http_utils import accepts_gzip
 from dotenv import load_dotenv
 load_dotenv()
 router = APIRouter(prefix="/api/analysis", tags=["analysis"])
 
+# Separator of comma-separated API key lists, swallowing surrounding whitespace
+_KEYS_RE = re.compile(r"\s*,\s*")
+
+
+def _parse_api_keys(raw_keys: str) -> List[str]:
+    """Split a comma-separated API key list into trimmed, non-empty keys."""
+    raw_keys = raw_keys.strip()
+    if ',' not in raw_keys:
+        return [raw_keys] if raw_keys else []
+    return [key for key in _KEYS_RE.split(raw_keys) if key]
+
+
 @router.post("/github", response_model=AnalysisResponse)
 async def analyze_github_repository(request: GitHubRequest):
     """Start analysis of a GitHub repository."""
@@ -23,7 +38,7 @@ async def analyze_github_repository(request: GitHubRequest):
             # Get from environment variable
             env_keys = os.getenv('GROQ_API_KEYS', '')
             if env_keys:
-                api_keys = [key.strip() for key in env_keys.split(',') if key.strip()]
+                api_keys = _parse_api_keys(env_keys)
         
         analysis_id = await analysis_service.start_github_analysis(
             str(request.github_url),
@@ -56,7 +71,7 @@ async def analyze_uploaded_file(
         # Parse API keys
         api_keys = []
         if groq_api_keys:
-            api_keys = [key.strip() for key in groq_api_keys.split(',') if key.strip()]
+            api_keys = _parse_api_keys(groq_api_keys)
         
         # Create temporary directory
         temp_dir = tempfile.mkdtemp(prefix="upload_")
@@ -99,30 +114,38 @@ async def get_analysis_status(analysis_id: str):
     
     return AnalysisResponse(
         analysis_id=analysis_id,
-        status=status_data['status'],
-        message=status_data['message'],
-        progress=status_data.get('progress'),
-        error=status_data.get('error')
+        status=status_data.status,
+        message=status_data.message,
+        progress=status_data.progress,
+        error=status_data.error
     )
 
 @router.get("/results/{analysis_id}")
-async def get_analysis_results(analysis_id: str):
+async def get_analysis_results(analysis_id: str, request: Request):
     """Get the complete results of an analysis."""
     
-    results = analysis_service.get_analysis_results(analysis_id)
+    results_file = analysis_service.get_results_file(analysis_id)
     
-    if not results:
+    if not results_file or not os.path.exists(results_file):
         raise HTTPException(status_code=404, detail="Results not found or analysis not completed")
     
-    return results
+    # The saved JSON is already the response body, so send it straight from
+    # disk, using the precompressed copy when the client accepts gzip
+    gzip_file = results_file + '.gz'
+    if accepts_gzip(request.headers.get('accept-encoding', '')) and os.path.exists(gzip_file):
+        return FileResponse(
+            gzip_file,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    
+    return FileResponse(results_file, media_type="application/json", headers={"Vary": "Accept-Encoding"})
 
 @router.get("/list")
 async def list_analyses():
     """List all analyses with their status."""
     
-    return {
-        "analyses": analysis_service.list_analyses()
-    }
+    return Response(content=analysis_service.list_analyses_json(), media_type="application/json")
 
 @router.delete("/cleanup")
 async def cleanup_old_analyses():
@@ -2,30 +2,55 @@
 
 import os
 import asyncio
+import functools
+import gzip
 import time
 import uuid
-import json
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
 from pathlib import Path
 
+import orjson
+
 from ..config import Config
-from ..models import AnalysisStatus, AnalysisResults, ProjectSummary, FileAnalysis
+from ..models import AnalysisStatus
 from dotenv import load_dotenv
-import sys
 load_dotenv()
 
-prototype_path = Path(__file__).parent.parent.parent.parent / "prototype"
-if str(prototype_path) not in sys.path:
-    sys.path.insert(0, str(prototype_path))
-from enhanced_doc_generator import EnhancedGitHubAnalyzer
+@dataclass(slots=True)
+class AnalysisRecord:
+    """Tracking state of a single analysis."""
+    status: AnalysisStatus
+    progress: int = 0
+    message: str = ""
+    github_url: str = ""
+    created_at_ts: float = 0.0
+    results_file: Optional[str] = None
+    error: Optional[str] = None
 
 class AnalysisService:
     """Service for handling repository analysis and documentation generation."""
     
     def __init__(self):
-        self.active_analyses: Dict[str, Dict[str, Any]] = {}
-        self.analyzer = EnhancedGitHubAnalyzer()
+        # Kept in creation order so expired analyses are always at the front
+        self.active_analyses: "OrderedDict[str, AnalysisRecord]" = OrderedDict()
+        
+        # Serialized /list response, rebuilt only after an analysis changes
+        self._list_cache: Optional[bytes] = None
+        
+        # Strong references to running analyses so they can be cancelled on shutdown
+        self._tasks: Set[asyncio.Task] = set()
+        
+        # Bounds how many analyses clone and call the LLM at once
+        self._analysis_slots = asyncio.Semaphore(Config.MAX_CONCURRENT_ANALYSES)
+    
+    @functools.cached_property
+    def analyzer(self):
+        """Comprehensive analyzer, imported and created on first use."""
+        from enhanced_doc_generator import EnhancedGitHubAnalyzer
+        return EnhancedGitHubAnalyzer()
     
     async def start_github_analysis(self, github_url: str, api_keys: Optional[List[str]] = None) -> str:
         """Start analysis of a GitHub repository."""
@@ -40,86 +65,99 @@ class AnalysisService:
             raise ValueError("No Groq API keys available")
         
         # Initialize analysis tracking
-        self.active_analyses[analysis_id] = {
-            'status': AnalysisStatus.PENDING,
-            'progress': 0,
-            'message': 'Analysis queued',
-            'github_url': github_url,
-            'created_at': datetime.now().isoformat(),
-            'results': None,
-            'error': None
-        }
+        self.active_analyses[analysis_id] = AnalysisRecord(
+            status=AnalysisStatus.PENDING,
+            message='Analysis queued',
+            github_url=github_url,
+            created_at_ts=time.time()
+        )
+        self._list_cache = None
         
         # Start analysis in background
-        asyncio.create_task(self._run_analysis(analysis_id, github_url, groq_keys))
+        task = asyncio.create_task(self._run_analysis(analysis_id, github_url, groq_keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
         
         return analysis_id
     
     async def _run_analysis(self, analysis_id: str, github_url: str, api_keys: List[str]):
         """Run the actual analysis in the background."""
         
-        try:
-            # Update status to processing
-            self.active_analyses[analysis_id].update({
-                'status': AnalysisStatus.PROCESSING,
-                'message': 'Starting repository analysis...',
-                'progress': 10
-            })
-            
-            # Run the comprehensive analysis
-            results = await self.analyzer.analyze_repository_comprehensive(github_url, api_keys)
-            
-            if "error" in results:
-                raise Exception(results["error"])
-            
-            # Update progress
-            self.active_analyses[analysis_id].update({
-                'progress': 90,
-                'message': 'Finalizing results...'
-            })
-            
-            # Save results to file
-            results_file = self._save_results(analysis_id, results)
-            
-            # Update status to completed
-            self.active_analyses[analysis_id].update({
-                'status': AnalysisStatus.COMPLETED,
-                'progress': 100,
-                'message': 'Analysis completed successfully',
-                'results': results,
-                'results_file': results_file
-            })
-            
-        except Exception as e:
-            # Update status to failed
-            self.active_analyses[analysis_id].update({
-                'status': AnalysisStatus.FAILED,
-                'message': f'Analysis failed: {str(e)}',
-                'error': str(e)
-            })
+        record = self.active_analyses[analysis_id]
+        
+        # Stay queued until one of the analysis slots frees up
+        async with self._analysis_slots:
+            try:
+                # Update status to processing
+                record.status = AnalysisStatus.PROCESSING
+                record.message = 'Starting repository analysis...'
+                record.progress = 10
+                self._list_cache = None
+                
+                # Run the comprehensive analysis
+                results = await self.analyzer.analyze_repository_comprehensive(github_url, api_keys)
+                
+                if "error" in results:
+                    raise Exception(results["error"])
+                
+                # Update progress
+                record.progress = 90
+                record.message = 'Finalizing results...'
+                self._list_cache = None
+                
+                # Save results to file
+                record.results_file = await self._save_results(analysis_id, results)
+                
+                # Update status to completed
+                record.status = AnalysisStatus.COMPLETED
+                record.progress = 100
+                record.message = 'Analysis completed successfully'
+                self._list_cache = None
+                
+            except Exception as e:
+                # Update status to failed
+                record.status = AnalysisStatus.FAILED
+                record.message = f'Analysis failed: {str(e)}'
+                record.error = str(e)
+                self._list_cache = None
+    
+    async def shutdown(self):
+        """Cancel running analyses and wait for them to finish."""
+        
+        for task in self._tasks:
+            task.cancel()
+        
+        await asyncio.gather(*self._tasks, return_exceptions=True)
     
-    def _save_results(self, analysis_id: str, results: Dict[str, Any]) -> str:
+    async def _save_results(self, analysis_id: str, results: Dict[str, Any]) -> str:
         """Save analysis results to file."""
         
         results_file = os.path.join(Config.RESULTS_DIR, f"analysis_{analysis_id}.json")
         
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, default=str)
+        # Serialize and write off the event loop so status polls stay responsive
+        payload = await asyncio.to_thread(
+            orjson.dumps, results, default=str, option=orjson.OPT_NON_STR_KEYS
+        )
+        await asyncio.to_thread(Path(results_file).write_bytes, payload)
+        
+        # Keep a gzipped copy next to it for clients that accept gzip
+        compressed = await asyncio.to_thread(gzip.compress, payload, compresslevel=4)
+        await asyncio.to_thread(Path(results_file + '.gz').write_bytes, compressed)
         
         return results_file
     
-    def get_analysis_status(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+    def get_analysis_status(self, analysis_id: str) -> Optional[AnalysisRecord]:
         """Get the status of an analysis."""
         return self.active_analyses.get(analysis_id)
     
-    def get_analysis_results(self, analysis_id: str) -> Optional[Dict[str, Any]]:
-        """Get the complete results of an analysis."""
+    def get_results_file(self, analysis_id: str) -> Optional[str]:
+        """Get the saved results file of a completed analysis."""
         
         analysis = self.active_analyses.get(analysis_id)
-        if not analysis or analysis['status'] != AnalysisStatus.COMPLETED:
+        if not analysis or analysis.status != AnalysisStatus.COMPLETED:
             return None
         
-        return analysis.get('results')
+        return analysis.results_file
     
     def list_analyses(self) -> List[Dict[str, Any]]:
         """List all analyses with their status."""
@@ -127,33 +165,44 @@ class AnalysisService:
         return [
             {
                 'analysis_id': aid,
-                'status': data['status'],
-                'progress': data.get('progress', 0),
-                'message': data['message'],
-                'created_at': data['created_at'],
-                'github_url': data.get('github_url', ''),
-                'has_results': data['status'] == AnalysisStatus.COMPLETED
+                'status': record.status,
+                'progress': record.progress,
+                'message': record.message,
+                'created_at': datetime.fromtimestamp(record.created_at_ts).isoformat(),
+                'github_url': record.github_url,
+                'has_results': record.status == AnalysisStatus.COMPLETED
             }
-            for aid, data in self.active_analyses.items()
+            for aid, record in self.active_analyses.items()
         ]
     
+    def list_analyses_json(self) -> bytes:
+        """Get the serialized analysis list, reusing it until an analysis changes."""
+        
+        if self._list_cache is None:
+            self._list_cache = orjson.dumps({"analyses": self.list_analyses()})
+        
+        return self._list_cache
+    
     def cleanup_old_analyses(self, max_age_hours: int = 24):
         """Clean up old analyses to free memory."""
         
-        current_time = datetime.now()
-        to_remove = []
+        cutoff = time.time() - max_age_hours * 3600
+        removed_count = 0
         
-        for analysis_id, data in self.active_analyses.items():
-            created_at = datetime.fromisoformat(data['created_at'])
-            age_hours = (current_time - created_at).total_seconds() / 3600
+        # Stop at the first analysis young enough to keep; everything after
+        # it was created later
+        while self.active_analyses:
+            oldest = next(iter(self.active_analyses.values()))
+            if oldest.created_at_ts >= cutoff:
+                break
             
-            if age_hours > max_age_hours:
-                to_remove.append(analysis_id)
+            self.active_analyses.popitem(last=False)
+            removed_count += 1
         
-        for analysis_id in to_remove:
-            del self.active_analyses[analysis_id]
+        if removed_count:
+            self._list_cache = None
         
-        return len(to_remove)
+        return removed_count
 
 # Global service instance
 analysis_service = AnalysisService()
\ No newline at end of file
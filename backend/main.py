@@ -1,41 +1,76 @@
 import os
 import sys
-import subprocess
+import asyncio
+import functools
+import glob
+import hashlib
+import mimetypes
+import stat
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI, HTTPException
-import io
+import tempfile
 import zipfile
+import orjson
 
-from fastapi.responses import StreamingResponse, FileResponse
-
-
-import uvicorn
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.datastructures import Headers
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.config import Config
+from app.http_utils import accepts_gzip
 from app.routes.analysis import router as analysis_router
-from dotenv import load_dotenv
+from app.services.analysis_service import analysis_service
+from dotenv import dotenv_values, load_dotenv
 load_dotenv()
-sys.path.append(os.path.abspath("../prototype"))
+
+ENV_FILE = Path(__file__).resolve().parent.parent / ".env"
+
+ZIP_DOWNLOAD_PREFIX = "/api/analysis/download/"
+ZIP_READ_WORKERS = 8
+ZIP_READ_AHEAD = 32
+LIST_FILES_BATCH_SIZE = 256
+
+# Seconds a superseded docs ZIP is kept so downloads already serving it finish
+ZIP_STALE_GRACE = 10 * 60
+
+# File types that deflate can't shrink further
+PRECOMPRESSED_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.pdf', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z'
+})
+
 
 def check_python_version():
-    if sys.version_info < (3, 8):
-        print("Python 3.8 or higher is required")
+    if sys.version_info < (3, 10):
+        print("Python 3.10 or higher is required")
         sys.exit(1)
     print(f"Python {sys.version_info.major}.{sys.version_info.minor} detected")
 
 
+@functools.lru_cache(maxsize=None)
+def _env_file_values():
+    """Parse the project .env file once; None if it doesn't exist."""
+    try:
+        with open(ENV_FILE, encoding='utf-8') as env_stream:
+            return dotenv_values(stream=env_stream)
+    except FileNotFoundError:
+        return None
+
+
 def check_env_file():
-    env_file = Path("../.env")
-    if not env_file.exists():
+    env_values = _env_file_values()
+    if env_values is None:
         print(".env file not found in parent directory")
         return False
 
-    content = env_file.read_text()
-    if "GROQ_API_KEYS" not in content:
+    if "GROQ_API_KEYS" not in env_values:
         print("GROQ_API_KEYS not found in .env file")
         return False
 
@@ -45,7 +80,11 @@ def check_env_file():
 
 def create_directories():
     for directory in ["results", "temp"]:
-        Path(directory).mkdir(exist_ok=True)
+        # One mkdir call; an existing directory is the common case
+        try:
+            os.mkdir(directory)
+        except FileExistsError:
+            pass
         print(f"Ensured directory exists: {directory}")
 
 
@@ -61,13 +100,36 @@ def startup_checks():
     print("=" * 60)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    
+    await analysis_service.shutdown()
+
 
 app = FastAPI(
     title="GitHub Documentation Generator API",
     description="Generate comprehensive documentation from GitHub repositories",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+class _DocsGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves ZIP downloads alone, as they are already compressed."""
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(ZIP_DOWNLOAD_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        
+        await super().__call__(scope, receive, send)
+
+
+# Level 1: JSON and markdown still shrink several times over at a fraction
+# of the CPU of the default level
+app.add_middleware(_DocsGZipMiddleware, minimum_size=1024, compresslevel=1)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -75,48 +137,112 @@ app.add_middleware(
         "http://127.0.0.1:56769"
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists let preflights be answered from the middleware's
+    # precomputed headers instead of echoing each request's values back
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 # Routers
 app.include_router(analysis_router)
 
-# Static results
-if os.path.exists(Config.RESULTS_DIR):
-    app.mount(
-        "/results",
-        StaticFiles(directory=Config.RESULTS_DIR),
-        name="results"
-    )
+class _PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that serves a file's precompressed .gz sibling to clients accepting gzip."""
+    
+    async def get_response(self, path: str, scope) -> Response:
+        if scope["method"] in ("GET", "HEAD") and accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            full_path, stat_result = await asyncio.to_thread(self.lookup_path, path + ".gz")
+            if stat_result and stat.S_ISREG(stat_result.st_mode):
+                response = self.file_response(full_path, stat_result, scope)
+                response.headers["Content-Type"] = mimetypes.guess_type(path)[0] or "application/octet-stream"
+                response.headers["Content-Encoding"] = "gzip"
+                response.headers["Vary"] = "Accept-Encoding"
+                return response
+        
+        return await super().get_response(path, scope)
+
+
+# Static results; saved analyses have a .json.gz next to each .json.
+# Config.load_config has already created the directory on import.
+app.mount(
+    "/results",
+    _PrecompressedStaticFiles(directory=Config.RESULTS_DIR, check_dir=False),
+    name="results"
+)
+
+
+def _scan_files(root: str, root_entries=None):
+    """
+    Yield a DirEntry for every file under root, in os.walk order.
+    
+    Symlinked directories are skipped rather than followed, and directories
+    that can't be listed are skipped, as with os.walk. root_entries may be
+    an already opened os.scandir(root).
+    """
+    subdirs = []
+    try:
+        entries = root_entries if root_entries is not None else os.scandir(root)
+    except OSError:
+        return
+    
+    with entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            else:
+                yield entry
+    
+    for path in subdirs:
+        yield from _scan_files(path)
+
+
 @app.get("/api/analysis/file/{output_dir}/{file_name}")
-async def get_file_content(output_dir: str, file_name: str):
+async def get_file_content(output_dir: str, file_name: str, raw: bool = False):
     """
     Fetch the content of a specific documentation file.
+    
+    With ?raw=1 the file itself is sent instead of a JSON wrapper.
     """
     try:
-        # Construct file path
-        file_path = os.path.join(output_dir, file_name)
+        # Construct the real file path, with symlinks and ".." resolved
+        base = Path(output_dir).resolve()
+        file_path = (base / file_name).resolve()
         
-        # Security check: prevent directory traversal
-        if not os.path.abspath(file_path).startswith(os.path.abspath(output_dir)):
+        # Security check: prevent directory traversal. Comparing path
+        # components means "docs-old" doesn't pass as being inside "docs".
+        if not file_path.is_relative_to(base):
             raise HTTPException(status_code=403, detail="Access denied")
         
         # Check if file exists
-        if not os.path.exists(file_path):
+        if not file_path.exists():
             raise HTTPException(status_code=404, detail=f"File not found: {file_name}")
         
-        # Read file content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Raw files go straight from disk to the socket
+        if raw:
+            return FileResponse(
+                file_path,
+                media_type="text/markdown",
+                filename=file_name,
+                content_disposition_type="inline"
+            )
+        
+        # Read file content off the event loop
+        data = await asyncio.to_thread(file_path.read_bytes)
+        content = data.decode('utf-8')
+        if '\r' in content:
+            # Keep the universal-newline translation text mode used to apply
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         
         return {
             "success": True,
             "file_name": file_name,
             "content": content,
-            "size": len(content)
+            "size": len(data)
         }
     
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     except PermissionError:
@@ -125,8 +251,114 @@ async def get_file_content(output_dir: str, file_name: str):
         raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
 
 
+def _docs_zip_info(entry: os.DirEntry, arcname: str, stat_result: os.stat_result) -> zipfile.ZipInfo:
+    """
+    Build a member header from the scan's stat instead of letting
+    ZipFile.write stat every file again.
+    """
+    zinfo = zipfile.ZipInfo(arcname, time.localtime(stat_result.st_mtime)[:6])
+    zinfo.external_attr = (stat_result.st_mode & 0xFFFF) << 16
+    
+    # Already-compressed formats are stored as-is
+    if os.path.splitext(entry.name)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+    
+    return zinfo
+
+
+def _read_file_bytes(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _read_ahead(entries, readers: ThreadPoolExecutor):
+    """
+    Yield (zinfo, data) for each scanned file in scan order.
+    
+    Reader threads fetch files ahead of the consumer, which compresses and
+    writes them. The read-ahead window bounds how many file contents are
+    held at once.
+    """
+    window = deque()
+    for entry, arcname, stat_result in entries:
+        window.append((_docs_zip_info(entry, arcname, stat_result),
+                       readers.submit(_read_file_bytes, entry.path)))
+        if len(window) >= ZIP_READ_AHEAD:
+            zinfo, data = window.popleft()
+            yield zinfo, data.result()
+    
+    while window:
+        zinfo, data = window.popleft()
+        yield zinfo, data.result()
+
+
+def _build_docs_zip(entries, cache_dir: str, zip_path: str):
+    """Write the scanned files to zip_path, atomically replacing any partial archive."""
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    
+    try:
+        # Level 1 deflate: docs are text, where it is several times faster
+        # than the default level for only a slightly larger archive. This
+        # stays on the stdlib zlib: zipfile offers no per-archive hook for
+        # another deflate, and swapping its module-wide zlib is not scoped
+        # to these downloads.
+        with os.fdopen(fd, 'wb') as tmp_file, \
+                ThreadPoolExecutor(max_workers=ZIP_READ_WORKERS) as readers:
+            with zipfile.ZipFile(tmp_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+                for zinfo, data in _read_ahead(entries, readers):
+                    zip_file.writestr(zinfo, data, compresslevel=1)
+        
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _get_docs_zip(output_dir: str) -> str:
+    """Get the path of a current ZIP of output_dir, building it if needed."""
+    prefix_len = len(os.path.join(output_dir, ''))
+    entries = [
+        (entry, entry.path[prefix_len:], entry.stat())
+        for entry in _scan_files(output_dir)
+    ]
+    
+    # Generated docs rarely change, so an archive is built once per
+    # version of the folder (file names, sizes and mtimes) and reused
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for entry, arcname, stat_result in entries:
+        fingerprint.update(f"{arcname}\0{stat_result.st_size}\0{stat_result.st_mtime_ns}\n".encode())
+    
+    dir_key = hashlib.blake2b(os.path.abspath(output_dir).encode(), digest_size=8).hexdigest()
+    cache_dir = os.path.join(Config.TEMP_DIR, "zip_cache")
+    zip_path = os.path.join(cache_dir, f"{dir_key}-{fingerprint.hexdigest()}.zip")
+    
+    try:
+        # Serving an archive restarts its grace period below
+        os.utime(zip_path)
+    except FileNotFoundError:
+        _build_docs_zip(entries, cache_dir, zip_path)
+    
+    # Only the current archive of each folder is kept. FileResponse opens
+    # lazily, so older ones get a grace period for downloads in flight.
+    cutoff = time.time() - ZIP_STALE_GRACE
+    for stale_path in glob.glob(os.path.join(cache_dir, f"{dir_key}-*.zip")):
+        if stale_path == zip_path:
+            continue
+        try:
+            if os.stat(stale_path).st_mtime < cutoff:
+                os.remove(stale_path)
+        except FileNotFoundError:
+            # Already pruned by a concurrent download
+            pass
+    
+    return zip_path
+
+
 # Download documentation as ZIP
-@app.get("/api/analysis/download/{output_dir}")
+@app.get(ZIP_DOWNLOAD_PREFIX + "{output_dir}")
 async def download_docs(output_dir: str):
     """
     Download the entire documentation folder as a ZIP file.
@@ -139,34 +371,59 @@ async def download_docs(output_dir: str):
         if not os.path.isdir(output_dir):
             raise HTTPException(status_code=400, detail="Invalid directory")
         
-        # Create ZIP file in memory
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Walk through the directory
-            for root, dirs, files in os.walk(output_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Get relative path for the archive
-                    arcname = os.path.relpath(file_path, output_dir)
-                    zip_file.write(file_path, arcname)
+        # Scanning, fingerprinting and zipping all block, so run them in a thread
+        zip_path = await asyncio.to_thread(_get_docs_zip, output_dir)
         
-        # Seek to beginning of buffer
-        zip_buffer.seek(0)
-        
-        # Return ZIP file as download
-        return StreamingResponse(
-            io.BytesIO(zip_buffer.getvalue()),
+        return FileResponse(
+            zip_path,
             media_type="application/zip",
-            headers={
-                "Content-Disposition": f"attachment; filename={output_dir}.zip"
-            }
+            filename=f"{output_dir}.zip"
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating ZIP: {str(e)}")
 
 
+def _iter_doc_files_json(output_dir: str, root_entries):
+    """
+    Yield the file listing of output_dir as chunks of one JSON document.
+    
+    Entries are encoded in batches as the tree is scanned, so large
+    folders are never held in memory as a whole. By now the response has
+    started, so files that vanish mid-scan are left out rather than
+    raising and cutting the document short.
+    """
+    prefix_len = len(os.path.join(output_dir, ''))
+    yield b'{"success":true,"directory":' + orjson.dumps(output_dir) + b',"files":['
+    
+    total = 0
+    batch = []
+    for entry in _scan_files(output_dir, root_entries):
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            continue
+        
+        batch.append(orjson.dumps({
+            "name": entry.name,
+            "path": entry.path[prefix_len:],
+            "size": size,
+            "type": "file"
+        }))
+        if len(batch) == LIST_FILES_BATCH_SIZE:
+            yield (b',' if total else b'') + b','.join(batch)
+            total += len(batch)
+            batch.clear()
+    
+    if batch:
+        yield (b',' if total else b'') + b','.join(batch)
+        total += len(batch)
+    
+    yield b'],"total":' + str(total).encode() + b'}'
+
+
 # List all files in documentation directory (optional but useful)
 @app.get("/api/analysis/files/{output_dir}")
 async def list_files(output_dir: str):
@@ -177,114 +434,72 @@ async def list_files(output_dir: str):
         if not os.path.exists(output_dir):
             raise HTTPException(status_code=404, detail="Directory not found")
         
-        files = []
-        for root, dirs, filenames in os.walk(output_dir):
-            for filename in filenames:
-                file_path = os.path.join(root, filename)
-                rel_path = os.path.relpath(file_path, output_dir)
-                file_size = os.path.getsize(file_path)
-                
-                files.append({
-                    "name": filename,
-                    "path": rel_path,
-                    "size": file_size,
-                    "type": "file"
-                })
+        # Open the root before any of the response is sent. A file or an
+        # unreadable directory lists as empty, as it did with os.walk.
+        try:
+            root_entries = await asyncio.to_thread(os.scandir, output_dir)
+        except OSError:
+            return {
+                "success": True,
+                "directory": output_dir,
+                "files": [],
+                "total": 0
+            }
         
-        return {
-            "success": True,
-            "directory": output_dir,
-            "files": files,
-            "total": len(files)
-        }
+        # The scan blocks, so Starlette pulls each chunk in a worker thread
+        return StreamingResponse(
+            _iter_doc_files_json(output_dir, root_entries),
+            media_type="application/json"
+        )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing files: {str(e)}")
 
 
-# If you're using Flask instead of FastAPI:
-"""
-from flask import Flask, jsonify, send_file
-import os
+# The root and health bodies never change between requests, so they are
+# encoded once and sent as raw bytes, skipping the JSON encoder per request
+_ROOT_BODY = orjson.dumps({
+    "message": "GitHub Documentation Generator API",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "analyze_github": "/api/analysis/github",
+        "analyze_upload": "/api/analysis/upload",
+        "get_status": "/api/analysis/status/{analysis_id}",
+        "get_results": "/api/analysis/results/{analysis_id}",
+        "list_analyses": "/api/analysis/list"
+    }
+})
 
-app = Flask(__name__)
 
-@app.route('/api/analysis/file/<output_dir>/<file_name>')
-def get_file_content(output_dir, file_name):
-    try:
-        file_path = os.path.join(output_dir, file_name)
-        
-        if not os.path.exists(file_path):
-            return jsonify({"error": "File not found"}), 404
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return jsonify({
-            "success": True,
-            "file_name": file_name,
-            "content": content
-        })
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+@functools.lru_cache(maxsize=1)
+def _health_body(groq_keys_count: int, results_dir: str, temp_dir: str) -> bytes:
+    """Encode the health body; re-encoded only if Config is reloaded with new values."""
+    return orjson.dumps({
+        "status": "healthy",
+        "groq_api_configured": groq_keys_count > 0,
+        "groq_keys_count": groq_keys_count,
+        "results_directory": results_dir,
+        "temp_directory": temp_dir
+    })
 
-@app.route('/api/analysis/download/<output_dir>')
-def download_docs(output_dir):
-    try:
-        if not os.path.exists(output_dir):
-            return jsonify({"error": "Directory not found"}), 404
-        
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for root, dirs, files in os.walk(output_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, output_dir)
-                    zip_file.write(file_path, arcname)
-        
-        zip_buffer.seek(0)
-        
-        return send_file(
-            zip_buffer,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=f'{output_dir}.zip'
-        )
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
-"""
 
 @app.get("/")
 async def root():
-    return {
-        "message": "GitHub Documentation Generator API",
-        "version": "1.0.0",
-        "status": "running",
-        "endpoints": {
-            "analyze_github": "/api/analysis/github",
-            "analyze_upload": "/api/analysis/upload",
-            "get_status": "/api/analysis/status/{analysis_id}",
-            "get_results": "/api/analysis/results/{analysis_id}",
-            "list_analyses": "/api/analysis/list"
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/health")
+@app.get("/health", include_in_schema=False)
 async def health_check():
-    return {
-        "status": "healthy",
-        "groq_api_configured": len(Config.GROQ_API_KEYS) > 0,
-        "groq_keys_count": len(Config.GROQ_API_KEYS),
-        "results_directory": Config.RESULTS_DIR,
-        "temp_directory": Config.TEMP_DIR
-    }
+    body = _health_body(len(Config.GROQ_API_KEYS), Config.RESULTS_DIR, Config.TEMP_DIR)
+    return Response(content=body, media_type="application/json")
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -295,6 +510,9 @@ async def global_exception_handler(request, exc):
 
 
 if __name__ == "__main__":
+    # Only needed to serve directly; importing the app shouldn't load the server
+    import uvicorn
+
     # Move to backend directory
     os.chdir(Path(__file__).parent)
 
@@ -311,10 +529,24 @@ if __name__ == "__main__":
     print("Docs:   http://localhost:8000/docs")
     print("=" * 60)
 
+    # ENV=dev reloads on changes and logs every request; otherwise only
+    # warnings are logged and the per-request access log is off
+    dev_mode = os.getenv("ENV") == "dev"
+
+    # A single worker process: analysis state lives in this process's memory.
+    # uvicorn picks uvloop and httptools when they're installed (they come
+    # with uvicorn[standard]) and falls back to asyncio and h11 otherwise;
+    # connections beyond the limit get a 503 instead of piling onto the loop.
+    # Reload needs an import string to re-import in the child process;
+    # otherwise the app object is passed so no module lookup is involved
     uvicorn.run(
-        "main:app",
+        "main:app" if dev_mode else app,
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        loop="auto",
+        http="auto",
+        limit_concurrency=Config.SERVER_LIMIT_CONCURRENCY,
+        reload=dev_mode,
+        log_level="info" if dev_mode else "warning",
+        access_log=dev_mode
     )
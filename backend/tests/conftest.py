@@ -0,0 +1,95 @@
+"""Shared fixtures for the backend tests."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+# Config creates its directories on import; keep them out of the checkout
+_CONFIG_DIR = tempfile.mkdtemp(prefix="ghdocs_tests_")
+os.environ.setdefault('RESULTS_DIR', os.path.join(_CONFIG_DIR, 'results'))
+os.environ.setdefault('TEMP_DIR', os.path.join(_CONFIG_DIR, 'temp'))
+
+
+def _file_record(file_path, language, purpose, is_backend, api_endpoints=(),
+                 functions=(), dependencies=()):
+    """A per-file record shaped like CodeExtractor.analyze_file's output."""
+    return {
+        'file_path': file_path,
+        'language': language,
+        'lines_of_code': 40,
+        'function_count': len(functions),
+        'api_count': len(api_endpoints),
+        'functions': list(functions),
+        'api_endpoints': list(api_endpoints),
+        'is_backend': is_backend,
+        'file_purpose': purpose,
+        'dependencies': list(dependencies),
+        'content_preview': ''
+    }
+
+
+@pytest.fixture
+def analyzed_files():
+    return [
+        _file_record(
+            'server/routes.py', 'python', 'API Controller', True,
+            api_endpoints=[
+                {'method': 'GET', 'path': '/items', 'framework': 'FastAPI', 'line': 12},
+                {'method': 'POST', 'path': '/items', 'framework': 'FastAPI', 'line': 20},
+            ],
+            functions=[
+                {'name': 'list_items', 'line': 13},
+                {'name': 'create_item', 'line': 21},
+            ],
+            dependencies=['fastapi', 'pydantic']
+        ),
+        _file_record(
+            'web/app.js', 'javascript', 'Entry Point', False,
+            functions=[{'name': 'render', 'line': 3}],
+            dependencies=['react']
+        ),
+    ]
+
+
+@pytest.fixture
+def analysis_result(analyzed_files):
+    from app.models import AnalysisResult, FileSummary
+    
+    return AnalysisResult(
+        repository_url='https://github.com/octo/shop',
+        repository_info={
+            'name': 'shop',
+            'owner': 'octo',
+            'full_name': 'octo/shop',
+            'url': 'https://github.com/octo/shop'
+        },
+        analysis_time=1.25,
+        summary=FileSummary(
+            total_files=2,
+            backend_files=1,
+            total_apis=2,
+            total_functions=3,
+            languages=['javascript', 'python'],
+            language_counts={'python': 1, 'javascript': 1},
+            purpose_counts={'API Controller': 1, 'Entry Point': 1},
+            dependencies={'fastapi', 'pydantic', 'react'}
+        ),
+        all_files=analyzed_files,
+        backend_files=analyzed_files[:1],
+        llm_analysis={
+            'server/routes.py': {
+                'description': 'Defines the item endpoints.',
+                'file_purpose': 'API Controller',
+                'api_count': 2,
+                'function_count': 2
+            }
+        }
+    )
@@ -0,0 +1,79 @@
+"""Tests for the analysis result cache in app.core.analyzer."""
+
+import asyncio
+from collections import OrderedDict
+
+import pytest
+
+from app.config import Config
+from app.core import analyzer
+from app.core.analyzer import GitHubAnalyzer
+
+REPO_URL = 'https://github.com/octo/shop'
+
+
+@pytest.fixture
+def fake_analyzer(monkeypatch, analyzed_files):
+    """A GitHubAnalyzer whose network and scan steps are recorded stand-ins."""
+    calls = {'resolve': 0, 'clone': 0}
+    
+    async def resolve_head(self, repo_url):
+        calls['resolve'] += 1
+        return 'a' * 40
+    
+    async def clone_repository(self, repo_url):
+        calls['clone'] += 1
+        return '/nonexistent'
+    
+    async def analyze_files(self, repo_path):
+        return analyzed_files
+    
+    monkeypatch.setattr(analyzer, '_result_cache', OrderedDict())
+    monkeypatch.setattr(GitHubAnalyzer, '_resolve_head', resolve_head)
+    monkeypatch.setattr(GitHubAnalyzer, '_clone_repository', clone_repository)
+    monkeypatch.setattr(GitHubAnalyzer, '_analyze_files', analyze_files)
+    
+    return calls
+
+
+def test_cache_hit_skips_the_clone_and_is_marked(fake_analyzer):
+    first = asyncio.run(GitHubAnalyzer().analyze_repository(REPO_URL, []))
+    
+    # Pretend the original run was slow
+    (cache_key, (stored_at, stored)), = analyzer._result_cache.items()
+    analyzer._result_cache[cache_key] = (
+        stored_at, stored.model_copy(update={'analysis_time': 120.0})
+    )
+    
+    second = asyncio.run(GitHubAnalyzer().analyze_repository(REPO_URL, []))
+    
+    assert fake_analyzer == {'resolve': 2, 'clone': 1}
+    assert not first.cached
+    assert second.cached
+    assert second.summary == first.summary
+    assert second.all_files == first.all_files
+    # The hit reports its own duration, not the original run's
+    assert second.analysis_time < 120.0
+
+
+def test_cache_is_keyed_by_whether_llm_keys_were_given(fake_analyzer, monkeypatch):
+    async def no_llm(self, analyzed_files):
+        return {}
+    
+    monkeypatch.setattr(analyzer.LLMProcessor, 'process_files', no_llm)
+    
+    asyncio.run(GitHubAnalyzer().analyze_repository(REPO_URL, []))
+    asyncio.run(GitHubAnalyzer().analyze_repository(REPO_URL, ['key']))
+    
+    assert fake_analyzer['clone'] == 2
+
+
+def test_disabled_cache_skips_resolving_head(fake_analyzer, monkeypatch):
+    monkeypatch.setattr(Config, 'RESULT_CACHE_SIZE', 0)
+    
+    result = asyncio.run(GitHubAnalyzer().analyze_repository(REPO_URL, []))
+    asyncio.run(GitHubAnalyzer().analyze_repository(REPO_URL, []))
+    
+    assert fake_analyzer == {'resolve': 0, 'clone': 2}
+    assert not result.cached
+    assert not analyzer._result_cache
@@ -0,0 +1,28 @@
+"""Tests for app.http_utils."""
+
+import pytest
+
+from app.http_utils import accepts_gzip
+
+
+@pytest.mark.parametrize('header', [
+    'gzip',
+    'gzip, deflate, br',
+    'br;q=1.0, GZIP;q=0.5',
+    'deflate, *',
+])
+def test_accepts_gzip(header):
+    assert accepts_gzip(header)
+
+
+@pytest.mark.parametrize('header', [
+    '',
+    'identity',
+    'x-gzip',
+    'gzip;q=0',
+    'gzip; q=0.0, deflate',
+    '*;q=0',
+    'gzip;q=0, *',
+])
+def test_refuses_gzip(header):
+    assert not accepts_gzip(header)
@@ -0,0 +1,109 @@
+"""Tests for the file and ZIP download helpers in main."""
+
+import asyncio
+import os
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+import main
+
+
+@pytest.fixture
+def docs_dir(tmp_path):
+    docs = tmp_path / 'docs'
+    (docs / 'guides').mkdir(parents=True)
+    (docs / 'README.md').write_text('# Docs\r\nline two\n', encoding='utf-8')
+    (docs / 'guides' / 'SETUP.md').write_text('setup\n' * 200, encoding='utf-8')
+    (docs / 'diagram.png').write_bytes(bytes(range(256)) * 4)
+    
+    # A sibling whose name starts with the docs directory's name
+    (tmp_path / 'docs-old').mkdir()
+    (tmp_path / 'docs-old' / 'secret.md').write_text('secret', encoding='utf-8')
+    (tmp_path / 'secret.txt').write_text('secret', encoding='utf-8')
+    
+    return docs
+
+
+def test_get_file_content_reads_inside_the_folder(docs_dir):
+    body = asyncio.run(main.get_file_content(str(docs_dir), 'README.md'))
+    
+    assert body['content'] == '# Docs\nline two\n'
+    assert body['size'] == len('# Docs\r\nline two\n')
+
+
+@pytest.mark.parametrize('file_name', [
+    '../secret.txt',
+    '../docs-old/secret.md',
+    'guides/../../secret.txt',
+])
+def test_get_file_content_refuses_traversal(docs_dir, file_name):
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(main.get_file_content(str(docs_dir), file_name))
+    
+    assert excinfo.value.status_code == 403
+
+
+def test_get_file_content_refuses_symlinks_out_of_the_folder(docs_dir):
+    link = docs_dir / 'escape.md'
+    try:
+        link.symlink_to(docs_dir.parent / 'secret.txt')
+    except OSError:
+        pytest.skip('symlinks are not available')
+    
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(main.get_file_content(str(docs_dir), 'escape.md'))
+    
+    assert excinfo.value.status_code == 403
+
+
+def _scanned_entries(root):
+    prefix_len = len(os.path.join(str(root), ''))
+    return [
+        (entry, entry.path[prefix_len:], entry.stat())
+        for entry in main._scan_files(str(root))
+    ]
+
+
+def test_build_docs_zip_is_byte_stable(docs_dir, tmp_path):
+    cache_dir = str(tmp_path / 'zip_cache')
+    first = os.path.join(cache_dir, 'first.zip')
+    second = os.path.join(cache_dir, 'second.zip')
+    
+    main._build_docs_zip(_scanned_entries(docs_dir), cache_dir, first)
+    main._build_docs_zip(_scanned_entries(docs_dir), cache_dir, second)
+    
+    with open(first, 'rb') as f, open(second, 'rb') as g:
+        assert f.read() == g.read()
+    assert sorted(os.listdir(cache_dir)) == ['first.zip', 'second.zip']
+
+
+def test_build_docs_zip_round_trips(docs_dir, tmp_path):
+    zip_path = str(tmp_path / 'docs.zip')
+    
+    main._build_docs_zip(_scanned_entries(docs_dir), str(tmp_path), zip_path)
+    
+    with zipfile.ZipFile(zip_path) as zip_file:
+        assert zip_file.testzip() is None
+        assert sorted(zip_file.namelist()) == [
+            'README.md', 'diagram.png', os.path.join('guides', 'SETUP.md')
+        ]
+        for name in zip_file.namelist():
+            assert zip_file.read(name) == (docs_dir / name).read_bytes()
+        
+        assert zip_file.getinfo('diagram.png').compress_type == zipfile.ZIP_STORED
+        assert zip_file.getinfo('README.md').compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_get_docs_zip_reuses_the_archive_until_the_folder_changes(docs_dir):
+    zip_path = main._get_docs_zip(str(docs_dir))
+    
+    assert main._get_docs_zip(str(docs_dir)) == zip_path
+    
+    (docs_dir / 'NEW.md').write_text('new\n', encoding='utf-8')
+    new_zip_path = main._get_docs_zip(str(docs_dir))
+    
+    assert new_zip_path != zip_path
+    # The superseded archive stays for downloads that are still streaming it
+    assert os.path.exists(zip_path)
@@ -0,0 +1,72 @@
+"""Render the documentation generators against stored baselines."""
+
+import asyncio
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import doc_generator, simple_doc_generator
+
+BASELINE_DIR = Path(__file__).parent / 'baselines'
+
+# Regenerate the stored output with UPDATE_BASELINES=1 after an intended change
+UPDATE_BASELINES = bool(os.environ.get('UPDATE_BASELINES'))
+
+_FROZEN_TIME = SimpleNamespace(strftime=lambda fmt: '2024-01-02 03:04:05')
+
+
+def _assert_matches_baseline(output_dir, names, baseline_dir):
+    for name in names:
+        rendered = (Path(output_dir) / name).read_text(encoding='utf-8')
+        baseline = baseline_dir / name
+        if UPDATE_BASELINES:
+            baseline.parent.mkdir(parents=True, exist_ok=True)
+            baseline.write_text(rendered, encoding='utf-8')
+        assert rendered == baseline.read_text(encoding='utf-8'), name
+
+
+def test_documentation_generator_matches_baseline(tmp_path, monkeypatch, analysis_result):
+    monkeypatch.setattr(doc_generator, 'time', _FROZEN_TIME)
+    
+    generator = doc_generator.DocumentationGenerator(str(tmp_path))
+    names = asyncio.run(generator.generate_all_docs(analysis_result))
+    
+    assert sorted(names) == [
+        'API_DOCUMENTATION.md', 'LLM_INSIGHTS.md', 'PROJECT_SUMMARY.md',
+        'README.md', 'SETUP_GUIDE.md'
+    ]
+    _assert_matches_baseline(tmp_path, names, BASELINE_DIR / 'full')
+
+
+def test_simple_documentation_generator_matches_baseline(tmp_path, monkeypatch, analysis_result):
+    monkeypatch.setattr(simple_doc_generator, 'time', _FROZEN_TIME)
+    
+    generator = simple_doc_generator.DocumentationGenerator(str(tmp_path))
+    names = generator.generate_all_docs(analysis_result)
+    
+    assert sorted(names) == ['API_DOCUMENTATION.md', 'PROJECT_SUMMARY.md', 'README.md']
+    _assert_matches_baseline(tmp_path, names, BASELINE_DIR / 'simple')
+
+
+@pytest.mark.parametrize('module, template', [
+    (doc_generator, 'readme.md.j2'),
+    (doc_generator, 'project_summary.md.j2'),
+    (simple_doc_generator, 'simple_readme.md.j2'),
+    (simple_doc_generator, 'simple_project_summary.md.j2'),
+])
+def test_cached_note_keeps_the_line_break(module, template, analysis_result):
+    cached = analysis_result.model_copy(update={'cached': True})
+    
+    rendered = module.TEMPLATE_ENV.get_template(template).render(
+        repo=cached.repository_info,
+        summary=cached.summary,
+        results=cached,
+        language_counts=[],
+        purpose_counts=[],
+        dependencies=[],
+        generated_at=''
+    )
+    
+    assert ' seconds (reused from an earlier analysis of this commit)\n\n## ' in rendered
@@ -1,6 +1,9 @@
 """Configuration and constants for GitHub documentation analyzer."""
 
 import os
+import sys
+import subprocess
+import importlib.util
 
 # Directory patterns to skip during analysis
 SKIP_DIRECTORIES = {
@@ -23,14 +26,28 @@ GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 MAX_TOKENS_PER_REQUEST = 4000
 MAX_CONCURRENT_REQUESTS = 5
 RATE_LIMIT_DELAY = 0.2  # seconds between requests
+LLM_CACHE_PATH = os.getenv('GHDOCS_LLM_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'github-to-docs', 'llm.sqlite'))
 
 # Required packages for installation
 REQUIRED_PACKAGES = [
     'gitpython', 'tree_sitter', 'tree_sitter_javascript', 'tree_sitter_typescript', 
     'tree_sitter_python', 'requests', 'groq', 'aiohttp', 'asyncio', 'pydantic',
-    'tiktoken', 'tenacity', 'networkx'
+    'tiktoken', 'tenacity', 'networkx', 'orjson'
 ]
 
+# Import names of packages whose pip name differs
+PACKAGE_IMPORT_NAMES = {'gitpython': 'git'}
+
+def install_missing_packages(packages=REQUIRED_PACKAGES):
+    """Install the packages that can't be imported yet, in one pip call."""
+    missing = [
+        pkg for pkg in packages
+        if importlib.util.find_spec(PACKAGE_IMPORT_NAMES.get(pkg, pkg)) is None
+    ]
+    if missing:
+        print(f'Installing missing packages: {", ".join(missing)}')
+        subprocess.run([sys.executable, '-m', 'pip', 'install', '-q', *missing], capture_output=True)
+
 def should_skip_directory(dirname: str) -> bool:
     """Check if directory should be skipped during analysis."""
     return dirname in SKIP_DIRECTORIES or dirname.startswith('.')
@@ -2,7 +2,6 @@
 
 import os
 import sys
-import subprocess
 import asyncio
 import json
 import time
@@ -11,19 +10,14 @@ from typing import List, Dict, Any
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
-# Install required packages quickly
-REQUIRED_PACKAGES = ['requests', 'aiohttp', 'pydantic', 'gitpython']
+from config import install_missing_packages
 
-def install_packages():
-    """Install packages in background."""
-    print(' Installing packages in background...')
-    for pkg in REQUIRED_PACKAGES:
-        subprocess.run([sys.executable, '-m', 'pip', 'install', '-q', pkg], 
-                      capture_output=True, check=False)
+# Packages that may be installed on startup
+REQUIRED_PACKAGES = ['requests', 'aiohttp', 'pydantic', 'gitpython', 'orjson']
 
-# Start package installation in background
-install_thread = threading.Thread(target=install_packages)
-install_thread.start()
+# Installing is opt-in, so importing this module never shells out to pip
+if os.environ.get('GHDOCS_AUTO_INSTALL'):
+    install_missing_packages(REQUIRED_PACKAGES)
 
 import re
 import tempfile
@@ -33,6 +27,13 @@ from dataclasses import dataclass
 from git import Repo
 import aiohttp
 
+# The llm modules import each other by top-level name
+_LLM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm')
+if _LLM_PATH not in sys.path:
+    sys.path.append(_LLM_PATH)
+
+from groq_client import create_session
+
 @dataclass
 class FastAPIEndpoint:
     method: str
@@ -317,7 +318,7 @@ class FastLLMProcessor:
         
         results = {}
         
-        async with aiohttp.ClientSession() as session:
+        async with create_session() as session:
             for file_analysis in backend_files:
                 try:
                     # Create optimized prompt focusing on APIs and functions
@@ -643,10 +644,6 @@ class FastGitHubAnalyzer:
 async def main():
     """Main entry point for fast analyzer."""
     
-    # Wait for package installation to complete
-    install_thread.join()
-    print('Package installation complete!')
-    
     print("Fast GitHub API Documentation Generator")
     print("=" * 50)
     
@@ -1,11 +1,14 @@
 """LLM integration and processing utilities."""
 
 from rate_limiter import RobustMultiKeyRateLimiter
-from groq_client import RobustGroqLLMClient
+from cache import LLMCache
+from groq_client import RobustGroqLLMClient, create_session
 from processor import GuaranteedLLMProcessor
 
 __all__ = [
     'RobustMultiKeyRateLimiter',
+    'LLMCache',
     'RobustGroqLLMClient', 
+    'create_session',
     'GuaranteedLLMProcessor'
 ]
\ No newline at end of file
@@ -33,7 +33,7 @@ class AdvancedRateLimiter:
     
     def _reset_limits_if_needed(self, key: str):
         """Reset rate limits if a minute has passed."""
-        now = time.time()
+        now = time.monotonic()
         rate_info = self.rate_limits[key]
         
         if now - rate_info.last_reset >= 60:  # 1 minute
@@ -46,7 +46,7 @@ class AdvancedRateLimiter:
     
     def _get_best_available_key(self, estimated_tokens: int = 1000) -> str:
         """Get the best available API key based on current usage."""
-        now = time.time()
+        now = time.monotonic()
         
         # Check global backoff
         if now < self.global_backoff_until:
@@ -123,7 +123,7 @@ class AdvancedRateLimiter:
         if key in self.rate_limits:
             rate_info = self.rate_limits[key]
             rate_info.consecutive_errors += 1
-            rate_info.last_error_time = time.time()
+            rate_info.last_error_time = time.monotonic()
             
             # Handle specific error codes
             if error_code == 429:  # Rate limit error
@@ -133,12 +133,12 @@ class AdvancedRateLimiter:
                 print(f"🚫 API key rate limited: {key[:10]}...")
             elif error_code in [500, 502, 503, 504]:  # Server errors
                 # Set global backoff for server issues
-                self.global_backoff_until = time.time() + 30
+                self.global_backoff_until = time.monotonic() + 30
                 print(f"🔄 Server error detected. Global backoff for 30s")
     
     def get_status(self) -> Dict[str, Any]:
         """Get current rate limiter status."""
-        now = time.time()
+        now = time.monotonic()
         status = {
             "total_keys": len(self.api_keys),
             "global_backoff": max(0, self.global_backoff_until - now),
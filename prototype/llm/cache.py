@@ -0,0 +1,85 @@
+"""Persistent cache of LLM responses keyed by prompt hash."""
+
+import atexit
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import orjson
+
+class LLMCache:
+    """SQLite-backed cache so unchanged files aren't sent to the LLM again.
+    
+    The cache is only an optimisation: if the database can't be opened it
+    falls back to an in-memory one, and failed reads and writes are misses.
+    """
+    
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        try:
+            self.conn = self._connect(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ LLM cache unavailable at {path} ({e}); caching in memory only")
+            self.conn = self._connect(":memory:")
+    
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        """Open the database at path and create the cache table."""
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache(key TEXT PRIMARY KEY, response BLOB, created_at REAL)"
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+    
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Hash the model and prompt; the prompt already folds in file path, content and analysis."""
+        return hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached response for key, or None."""
+        try:
+            with self.lock:
+                row = self.conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            return orjson.loads(row[0]) if row else None
+        except (sqlite3.Error, orjson.JSONDecodeError):
+            return None
+    
+    def set(self, key: str, response: dict):
+        """Store a response, replacing any previous one for key."""
+        data = orjson.dumps(response)
+        try:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache(key, response, created_at) VALUES (?, ?, ?)",
+                    (key, data, time.time())
+                )
+                self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not write LLM cache entry: {e}")
+    
+    def close(self):
+        """Close the database connection."""
+        with self.lock:
+            self.conn.close()
+
+@functools.lru_cache(maxsize=None)
+def get_shared_cache(path: str) -> LLMCache:
+    """Return the process-wide cache for path, opening its connection once."""
+    cache = LLMCache(path)
+    atexit.register(cache.close)
+    return cache
@@ -6,6 +6,7 @@ import json
 import time
 from typing import Dict, Any, List, Optional
 from .advanced_rate_limiter import AdvancedRateLimiter
+from groq_client import create_session
 
 class EnhancedLLMProcessor:
     """Enhanced LLM processor with intelligent rate limiting and error handling."""
@@ -17,7 +18,7 @@ class EnhancedLLMProcessor:
         
     async def __aenter__(self):
         """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        self.session = create_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -2,31 +2,65 @@
 
 import asyncio
 import aiohttp
+import orjson
 import re
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 import sys
 import os
 
 # Add parent directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
-sys.path.insert(0, parent_dir)
-sys.path.insert(0, os.path.join(parent_dir, 'models'))
+# Appended rather than prepended so a host app's own modules aren't shadowed
+for path in (parent_dir, os.path.join(parent_dir, 'models')):
+    if path not in sys.path:
+        sys.path.append(path)
 
 from summary_models import LLMSummaryRequest, LLMSummaryResponse
 from rate_limiter import RobustMultiKeyRateLimiter
+from cache import LLMCache, get_shared_cache
+from config import MAX_CONCURRENT_REQUESTS, LLM_CACHE_PATH
+
+# Extended timeout for reliability
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+def _json_dumps(obj) -> str:
+    return orjson.dumps(obj).decode()
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create the pooled HTTP session for Groq requests.
+    
+    Reuse one session for a whole analysis run rather than one per file,
+    so connections (and their TLS handshakes) are shared across requests.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONCURRENT_REQUESTS * 2,
+        limit_per_host=MAX_CONCURRENT_REQUESTS,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(connector=connector, json_serialize=_json_dumps)
 
 class RobustGroqLLMClient:
     """Ultra-robust Groq LLM client that ensures analysis completion."""
     
-    def __init__(self, api_keys: List[str], rate_limiter: RobustMultiKeyRateLimiter):
+    def __init__(self, api_keys: List[str], rate_limiter: RobustMultiKeyRateLimiter, cache: Optional[LLMCache] = None):
         self.api_keys = api_keys
         self.rate_limiter = rate_limiter
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
+        self.model = "llama-3.1-8b-instant"
+        # Shared by every client in the process, so there is one connection to close
+        self.cache = cache if cache is not None else get_shared_cache(LLM_CACHE_PATH)
         
     async def generate_summary_with_guarantee(self, session: aiohttp.ClientSession, request: LLMSummaryRequest) -> LLMSummaryResponse:
-        """Generate file summary with guarantee of completion - no fallbacks allowed."""
+        """
+        Generate file summary with guarantee of completion - no fallbacks allowed.
+        
+        session should come from create_session() and be shared across files.
+        """
         max_retries = 15  # Increased retries for guarantee
         retry_delays = [1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 240, 300, 360]  # Progressive delays
         
@@ -35,6 +69,13 @@ class RobustGroqLLMClient:
         prompt = self._build_analysis_prompt(request.file_path, content, request.analysis)
         estimated_tokens = self.rate_limiter.estimate_tokens(prompt)
         
+        # Unchanged files produce the same prompt, so reuse the earlier answer
+        cache_key = self.cache.make_key(self.model, prompt)
+        cached = await asyncio.to_thread(self.cache.get, cache_key)
+        if cached is not None:
+            print(f"💾 Cached: {request.file_path}")
+            return LLMSummaryResponse.model_validate(cached)
+        
         print(f"🎯 Guaranteed processing: {request.file_path} ({estimated_tokens} tokens)")
         
         for attempt in range(max_retries):
@@ -43,7 +84,7 @@ class RobustGroqLLMClient:
                 api_key = await self.rate_limiter.wait_for_available_key_async(estimated_tokens, max_wait_time=600)
                 
                 payload = {
-                    "model": "llama-3.1-8b-instant",
+                    "model": self.model,
                     "messages": [
                         {
                             "role": "system",
@@ -63,10 +104,7 @@ class RobustGroqLLMClient:
                     "Content-Type": "application/json"
                 }
                 
-                # Extended timeout for reliability
-                timeout = aiohttp.ClientTimeout(total=60)
-                
-                async with session.post(self.base_url, json=payload, headers=headers, timeout=timeout) as response:
+                async with session.post(self.base_url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT) as response:
                     if response.status == 200:
                         result = await response.json()
                         content_response = result['choices'][0]['message']['content']
@@ -76,7 +114,13 @@ class RobustGroqLLMClient:
                         self.rate_limiter.record_request(api_key, actual_tokens, success=True)
                         
                         print(f"✅ Success: {request.file_path} (attempt {attempt + 1})")
-                        return self._parse_llm_response(request.file_path, content_response)
+                        summary, parsed = self._parse_llm_response(request.file_path, content_response)
+                        
+                        # A reply without a SUMMARY section only got the placeholder
+                        # summary, so it isn't kept for later runs
+                        if parsed:
+                            await asyncio.to_thread(self.cache.set, cache_key, summary.model_dump())
+                        return summary
                         
                     elif response.status == 429:
                         # Rate limit hit - mark key and try again
@@ -322,8 +366,8 @@ Focus on providing COMPLETE, actionable documentation."""
         
         return 30.0  # Default wait time
     
-    def _parse_llm_response(self, file_path: str, content: str) -> LLMSummaryResponse:
-        """Parse comprehensive LLM response."""
+    def _parse_llm_response(self, file_path: str, content: str) -> Tuple[LLMSummaryResponse, bool]:
+        """Parse comprehensive LLM response; the flag tells whether a summary was found."""
         lines = content.split('\n')
         
         summary = ""
@@ -353,11 +397,13 @@ Focus on providing COMPLETE, actionable documentation."""
                 else:
                     key_insights.append(f"[{current_section.upper()}] {line}")
         
-        return LLMSummaryResponse(
+        response = LLMSummaryResponse(
             file_path=file_path,
             summary=summary or f"Comprehensive analysis of {Path(file_path).name}",
             key_insights=key_insights[:10],  # Limit to prevent overflow
             architectural_role=architectural_role or "Application component",
             complexity_assessment=complexity_assessment or "Standard complexity",
             improvement_suggestions=improvement_suggestions
-        )
\ No newline at end of file
+        )
+        
+        return response, bool(summary)
@@ -16,7 +16,7 @@ sys.path.insert(0, os.path.join(parent_dir, 'models'))
 from analysis_models import DetailedFileAnalysis
 from summary_models import LLMSummaryRequest
 from rate_limiter import RobustMultiKeyRateLimiter
-from groq_client import RobustGroqLLMClient
+from groq_client import RobustGroqLLMClient, create_session
 
 class GuaranteedLLMProcessor:
     """Guaranteed LLM processing with robust error handling and optimization."""
@@ -56,7 +56,7 @@ class GuaranteedLLMProcessor:
             return files_data
         
         # Process files with LLM
-        async with aiohttp.ClientSession() as session:
+        async with create_session() as session:
             tasks = []
             for file_analysis in files_to_process:
                 content = file_contents.get(file_analysis.file, "")
@@ -1,17 +1,14 @@
 import os
 import sys
-import subprocess
 import asyncio
 from pathlib import Path
 from typing import List, Dict, Any
 from fastapi import FastAPI, HTTPException
 
-# Install required packages
-from config import REQUIRED_PACKAGES
-
-print('Installing packages...')
-for pkg in REQUIRED_PACKAGES:
-    subprocess.run([sys.executable, '-m', 'pip', 'install', '-q', pkg], capture_output=True)
+# Installing is opt-in, so importing this module never shells out to pip
+if os.environ.get('GHDOCS_AUTO_INSTALL'):
+    from config import install_missing_packages
+    install_missing_packages()
 
 # Now import the modules
 import sys
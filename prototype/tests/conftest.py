@@ -0,0 +1,13 @@
+"""Put the prototype's modules on sys.path the way its scripts expect."""
+
+import sys
+from pathlib import Path
+
+PROTOTYPE_DIR = Path(__file__).resolve().parent.parent
+
+# utils/__init__.py imports its siblings as top-level modules. Appended, as
+# in the backend's app package, so backend modules of the same name (e.g.
+# main) keep priority when both suites run together.
+for path in (PROTOTYPE_DIR, PROTOTYPE_DIR / 'utils'):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
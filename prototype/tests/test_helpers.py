@@ -0,0 +1,51 @@
+"""Tests for utils.helpers."""
+
+import pytest
+import tiktoken
+
+from utils import helpers
+
+
+def _byte_encoding():
+    """A tiktoken encoding that needs no download: one token per byte."""
+    return tiktoken.Encoding(
+        name='bytes',
+        pat_str=r"\S+|\s+",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={'<|endoftext|>': 256}
+    )
+
+
+def test_count_tokens_counts_special_tokens_as_text(monkeypatch):
+    monkeypatch.setattr(helpers, '_get_encoding', lambda model: _byte_encoding())
+    
+    text = 'print("<|endoftext|>")'
+    
+    assert helpers.count_tokens(text) == len(text.encode())
+
+
+def test_count_tokens_falls_back_for_unknown_models():
+    assert helpers.count_tokens('one two three', model='no-such-model') == 3 * 1.3
+
+
+KEY_A = 'gsk_' + 'a' * 30
+KEY_B = 'gsk_' + 'b' * 30
+
+
+@pytest.mark.parametrize('keys_input', [
+    f'{KEY_A},{KEY_B}',
+    f' {KEY_A} ; {KEY_B} ',
+    f'{KEY_A}\n\n{KEY_B}\n',
+    f'{KEY_A},;\n{KEY_B}',
+])
+def test_parse_api_keys_accepts_every_separator(keys_input):
+    assert helpers.parse_api_keys(keys_input) == [KEY_A, KEY_B]
+
+
+def test_parse_api_keys_drops_short_entries():
+    assert helpers.parse_api_keys(f'short,{KEY_A}, ') == [KEY_A]
+
+
+@pytest.mark.parametrize('keys_input', ['', None])
+def test_parse_api_keys_empty_input(keys_input):
+    assert helpers.parse_api_keys(keys_input) == []
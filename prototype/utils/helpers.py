@@ -1,25 +1,21 @@
 """Helper utility functions."""
 
 import re
+import functools
 from typing import List
 import tiktoken
+from pydantic import BaseModel
+
+# Keys are separated by commas, semicolons, or newlines
+_KEY_SPLIT_RE = re.compile(r'[,;\n]+')
 
 def parse_api_keys(keys_input: str) -> List[str]:
     """Parse API keys from user input, supporting multiple formats."""
     if not keys_input:
         return []
     
-    # Split by comma, semicolon, or newline
-    keys = re.split(r'[,;\n]+', keys_input)
-    
-    # Clean and validate keys
-    cleaned_keys = []
-    for key in keys:
-        key = key.strip()
-        if key and len(key) > 20:  # Basic validation
-            cleaned_keys.append(key)
-    
-    return cleaned_keys
+    # Clean and validate keys (basic length check)
+    return [key for key in map(str.strip, _KEY_SPLIT_RE.split(keys_input)) if len(key) > 20]
 
 def dict_to_object(d):
     """Convert dictionary to object with attribute access."""
@@ -54,29 +50,34 @@ def estimate_processing_time(num_files: int, num_keys: int) -> str:
         minutes = int((estimated_seconds % 3600) / 60)
         return f"~{hours}h {minutes}m"
 
+@functools.lru_cache(maxsize=8)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Look up the tiktoken encoding for a model once."""
+    return tiktoken.encoding_for_model(model)
+
 def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
     """Count tokens in text using tiktoken."""
     try:
-        encoding = tiktoken.encoding_for_model(model)
-        return len(encoding.encode(text))
-    except:
-        # Fallback: rough estimation
+        # File contents may contain special tokens such as <|endoftext|>;
+        # count them as plain text rather than having encode() reject them
+        return len(_get_encoding(model).encode(text, disallowed_special=()))
+    except (KeyError, OSError):
+        # Fallback: rough estimation for unknown models, or when the BPE
+        # ranks can't be downloaded
         return len(text.split()) * 1.3
 
 def convert_to_dict(obj):
     """Convert FileAnalysis and related objects to dictionaries for JSON serialization."""
+    # Pydantic models are dumped by pydantic-core in one call
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, list):
+        return [convert_to_dict(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: convert_to_dict(value) for key, value in obj.items()}
     if hasattr(obj, '__dict__'):
-        result = {}
-        for key, value in obj.__dict__.items():
-            if isinstance(value, list):
-                result[key] = [convert_to_dict(item) for item in value]
-            elif hasattr(value, '__dict__'):
-                result[key] = convert_to_dict(value)
-            else:
-                result[key] = value
-        return result
-    else:
-        return obj
+        return {key: convert_to_dict(value) for key, value in obj.__dict__.items()}
+    return obj
 
 def truncate_content(content: str, max_tokens: int = 3000) -> str:
     """Truncate content to fit within token limits."""